@@ -0,0 +1,245 @@
+import random
+import time
+
+from src.cfr_solver import history_key, load_policy_table
+from src.equity import (
+    batch_categories, batch_percentiles, calculate_equity, encode_card, get_percentiles, hand_bucket,
+    hand_percentile, hand_value, keep_order, planned_discard, value_category
+)
+
+CFR_POLICY_PATH = "data/cfr_policy.tbl"
+
+
+class BotPolicy:
+    name = "default"
+
+    def __init__(self, deadline=0.05, rng=None, cache=None):
+        self.deadline = deadline
+        self.rng = rng or random.Random()
+        self.cache = cache
+
+    def decide(self, engine, player, to_call) -> str:
+        raise NotImplementedError
+
+    def decide_batch(self, requests):
+        return [self.decide(engine, player, to_call) for engine, player, to_call in requests]
+
+    def raise_amount(self, engine, player, to_call):
+        return None
+
+    def discard(self, engine, player):
+        return planned_discard([encode_card(card) for card in player.get_hand()])
+
+    def discard_batch(self, requests):
+        hands = [[encode_card(card) for card in player.get_hand()] for _, player in requests]
+        return [planned_discard(codes, category) for codes, category in zip(hands, batch_categories(hands))]
+
+    def legal_action(self, action, player, to_call, big_blind):
+        stack = player.get_stack_amount()
+        if stack <= 0:
+            return 'check' if to_call == 0 else 'fold'
+        if action == 'raise' and stack < to_call + big_blind:
+            action = 'call'
+        if action in ('call', 'fold') and to_call == 0:
+            return 'check'
+        if action == 'call' and stack < to_call:
+            return 'fold'
+        if action == 'check' and to_call > 0:
+            return 'fold'
+        return action
+
+
+class RandomPolicy(BotPolicy):
+    name = "random"
+
+    def decide(self, engine, player, to_call) -> str:
+        if to_call == 0:
+            action = "check" if self.rng.random() < 0.7 else "raise"
+        else:
+            action = self.rng.choice(["call"] * 5 + ["fold"] * 3 + ["raise"] * 2)
+        return self.legal_action(action, player, to_call, engine.big_blind)
+
+
+class StrengthPolicy(BotPolicy):
+    name = "strength"
+
+    POT_ODDS_BUCKETS = 10
+
+    def __init__(self, deadline=0.05, min_trials=200, max_trials=3000,
+                 raise_threshold=0.65, call_margin=0.05, bluff=0.05, rng=None, cache=None):
+        super().__init__(deadline, rng, cache)
+        self.min_trials = min_trials
+        self.max_trials = max_trials
+        self.raise_threshold = raise_threshold
+        self.call_margin = call_margin
+        self.bluff = bluff
+        self.decisions = 0
+        self.fallbacks = 0
+        get_percentiles()
+
+    def decide(self, engine, player, to_call, percentile=None) -> str:
+        started = time.perf_counter()
+        self.decisions += 1
+        pot_odds = to_call / (engine.pot + to_call) if to_call > 0 else 0.0
+
+        key = self.situation(engine, player, to_call, pot_odds) if self.cache is not None else None
+        action = self.cache.get(key) if key is not None else None
+        if action is None:
+            action = self.base_action(self.strength(engine, player, started, percentile), to_call, pot_odds)
+            if key is not None:
+                self.cache.put(key, action)
+
+        if action == 'check' and self.rng.random() < self.bluff:
+            action = 'raise'
+        elif action == 'fold' and self.rng.random() < self.bluff / 2:
+            action = 'raise'
+        return self.legal_action(action, player, to_call, engine.big_blind)
+
+    def decide_batch(self, requests):
+        if self.deadline > 0:
+            return super().decide_batch(requests)
+        percentiles = batch_percentiles([[encode_card(card) for card in player.get_hand()]
+                                         for _, player, _ in requests])
+        return [self.decide(engine, player, to_call, percentile)
+                for (engine, player, to_call), percentile in zip(requests, percentiles)]
+
+    def base_action(self, strength, to_call, pot_odds):
+        if to_call == 0:
+            return 'raise' if strength >= self.raise_threshold else 'check'
+        if strength < pot_odds + self.call_margin:
+            return 'fold'
+        if strength >= max(self.raise_threshold, pot_odds + 0.25):
+            return 'raise'
+        return 'call'
+
+    def situation(self, engine, player, to_call, pot_odds):
+        codes = [encode_card(card) for card in player.get_hand()]
+        active = [p for p in engine.players if not p.folded]
+        position = active.index(player) if player in active else len(active)
+        hand_class = (value_category(hand_value(codes)), keep_order(codes)[0] >> 2)
+        odds_bucket = min(int(pot_odds * self.POT_ODDS_BUCKETS), self.POT_ODDS_BUCKETS - 1)
+        return hand_class + (engine.current_stage, len(active), to_call > 0, odds_bucket, position)
+
+    def strength(self, engine, player, started=None, percentile=None):
+        started = started if started is not None else time.perf_counter()
+        hand = player.get_hand()
+        codes = [encode_card(card) for card in hand]
+        opponents = [p for p in engine.players if p is not player and not p.folded]
+        if not opponents:
+            return 1.0
+
+        budget = self.deadline - (time.perf_counter() - started)
+        if budget > 0:
+            draw_counts = [self.expected_draw(engine, p) for p in opponents]
+            discard = () if player.get_name() in engine.draw_counts else planned_discard(codes)
+            result = calculate_equity(hand, len(opponents), draw_counts=draw_counts, discard=discard,
+                                      max_trials=self.max_trials, time_budget=budget,
+                                      chunk_size=self.min_trials // 4 or 1)
+            if result.trials() >= self.min_trials:
+                return result.equity()
+
+        self.fallbacks += 1
+        if percentile is None:
+            percentile = hand_percentile(codes)
+        return percentile ** len(opponents)
+
+    def expected_draw(self, engine, player):
+        if player.get_name() in engine.draw_counts:
+            return engine.draw_counts[player.get_name()]
+        stats = engine.opponent_model.get(player.get_name())
+        return round(stats.average_draw()) if sum(stats.draw_counts) else 0
+
+
+class CfrPolicy(BotPolicy):
+    name = "cfr"
+
+    def __init__(self, deadline=0.05, rng=None, cache=None, table_path=CFR_POLICY_PATH):
+        super().__init__(deadline, rng, cache)
+        self.fallback = StrengthPolicy(deadline, rng=self.rng, cache=cache)
+        self.table = None
+        self.lookups = 0
+        self.misses = 0
+        self.unmapped = 0
+        try:
+            self.table = load_policy_table(table_path)
+        except (IOError, ValueError) as e:
+            print(f"Brak tabeli strategii CFR ({e}), boty używają strategii siły ręki")
+
+    def decide(self, engine, player, to_call) -> str:
+        active = [p for p in engine.players if not p.folded]
+        if self.table is None or len(active) != 2:
+            return self.fallback.decide(engine, player, to_call)
+
+        history = self.abstract_history(engine, player)
+        if history is None:
+            self.unmapped += 1
+            return self.fallback.decide(engine, player, to_call)
+
+        self.lookups += 1
+        key = history_key(history)
+        codes = [encode_card(card) for card in player.get_hand()]
+        strategy = self.table.strategy(key, hand_bucket(codes, self.table.buckets))
+        if strategy is None:
+            self.misses += 1
+            return self.fallback.decide(engine, player, to_call)
+
+        action = self.rng.choices(self.table.actions(key), weights=strategy)[0]
+        if action == "f":
+            action = 'fold'
+        elif action == "c":
+            action = 'call'
+        else:
+            action = 'raise'
+        return self.legal_action(action, player, to_call, engine.big_blind)
+
+    def abstract_history(self, engine, player):
+        seats = [index for index, p in enumerate(engine.players) if not p.folded]
+        order = sorted(seats, key=lambda seat: engine.blinds.get(seat, 0))
+        if [engine.blinds.get(seat, 0) for seat in order] != [engine.small_blind, engine.big_blind]:
+            return None
+
+        sizes = self.table.raise_sizes
+        history = []
+        contributed = {seat: engine.blinds[seat] for seat in order}
+        level = engine.big_blind
+        for bet in engine.bets:
+            if bet["stage"] != engine.current_stage:
+                continue
+            seat = bet["player_id"] - 1
+            if seat not in contributed:
+                if bet["action"] == 'fold':
+                    continue
+                return None
+            if seat != order[len(history) % 2]:
+                return None
+            if bet["action"] == 'fold':
+                history.append("f")
+            elif bet["action"] == 'raise':
+                call_part = max(0, level - contributed.get(seat, 0))
+                raised = (bet["amount"] - call_part) / engine.big_blind
+                history.append(f"r{min(sizes, key=lambda size: abs(size - raised))}")
+            else:
+                history.append("c")
+            contributed[seat] += bet["amount"]
+            level = max(level, contributed[seat])
+
+        if engine.players.index(player) != order[len(history) % 2]:
+            return None
+        return tuple(history)
+
+
+POLICIES = {
+    RandomPolicy.name: RandomPolicy,
+    StrengthPolicy.name: StrengthPolicy,
+    CfrPolicy.name: CfrPolicy
+}
+
+
+def create_policy(name, **options):
+    if name in (None, BotPolicy.name):
+        return None
+    policy_class = POLICIES.get(name)
+    if policy_class is None:
+        print(f"Nieznana strategia botów '{name}', używam domyślnej")
+        return None
+    return policy_class(**options)
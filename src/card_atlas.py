@@ -0,0 +1,130 @@
+import argparse
+import json
+import os
+
+from PyQt5.QtCore import Qt, QRect
+from PyQt5.QtGui import QImage, QPainter
+
+from src.config import CACHE_DIR
+
+CARDS_DIR = os.path.join(os.path.dirname(__file__), "cards")
+ATLAS_DIR = os.path.join(CACHE_DIR, "atlas")
+CARD_RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+CARD_SUITS = ['S', 'H', 'D', 'C']
+ATLAS_VERSION = 1
+
+
+def available_skins():
+    return sorted(name for name in os.listdir(CARDS_DIR)
+                  if not name.startswith('.') and os.path.isdir(os.path.join(CARDS_DIR, name)))
+
+
+def source_path(skin, code):
+    path_png = os.path.join(CARDS_DIR, skin, f"{code}.png")
+    if os.path.exists(path_png):
+        return path_png
+    return os.path.join(CARDS_DIR, skin, f"{code}.jpg")
+
+
+def source_mtime(skin):
+    skin_dir = os.path.join(CARDS_DIR, skin)
+    mtimes = [os.path.getmtime(skin_dir)]
+    for entry in os.scandir(skin_dir):
+        if entry.is_file():
+            mtimes.append(entry.stat().st_mtime)
+    return max(mtimes)
+
+
+def atlas_paths(skin, width, height, scale):
+    name = f"{skin}_{width}x{height}@{scale:g}x"
+    return os.path.join(ATLAS_DIR, f"{name}.png"), os.path.join(ATLAS_DIR, f"{name}.json")
+
+
+def build_atlas(skin, width=100, height=150, scale=1.0):
+    tile_width = round(width * scale)
+    tile_height = round(height * scale)
+    atlas = QImage(tile_width * len(CARD_RANKS), tile_height * len(CARD_SUITS),
+                   QImage.Format_ARGB32_Premultiplied)
+    atlas.fill(Qt.transparent)
+
+    cards = {}
+    painter = QPainter(atlas)
+    for row, suit in enumerate(CARD_SUITS):
+        for column, rank in enumerate(CARD_RANKS):
+            code = f"{rank}{suit}"
+            image = QImage(source_path(skin, code))
+            if image.isNull():
+                continue
+            image = image.scaled(tile_width, tile_height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            x = column * tile_width
+            y = row * tile_height
+            painter.drawImage(x, y, image)
+            cards[code] = [x, y, image.width(), image.height()]
+    painter.end()
+
+    index = {
+        "version": ATLAS_VERSION,
+        "skin": skin,
+        "width": width,
+        "height": height,
+        "scale": scale,
+        "source_mtime": source_mtime(skin),
+        "cards": cards
+    }
+
+    image_path, index_path = atlas_paths(skin, width, height, scale)
+    os.makedirs(ATLAS_DIR, exist_ok=True)
+    if not atlas.save(image_path + ".tmp", "PNG"):
+        raise IOError(f"Nie można zapisać atlasu: {image_path}")
+    os.replace(image_path + ".tmp", image_path)
+    with open(index_path + ".tmp", 'w', encoding='utf-8') as index_file:
+        json.dump(index, index_file)
+    os.replace(index_path + ".tmp", index_path)
+
+    return atlas, index
+
+
+def load_atlas(skin, width=100, height=150, scale=1.0):
+    image_path, index_path = atlas_paths(skin, width, height, scale)
+    try:
+        with open(index_path, 'r', encoding='utf-8') as index_file:
+            index = json.load(index_file)
+        if index.get("version") == ATLAS_VERSION and index.get("source_mtime") >= source_mtime(skin):
+            atlas = QImage(image_path)
+            if not atlas.isNull():
+                return atlas, index
+    except (IOError, ValueError, TypeError):
+        pass
+
+    try:
+        return build_atlas(skin, width, height, scale)
+    except (IOError, OSError) as e:
+        print(f"Błąd budowania atlasu kart: {e}")
+        return None, None
+
+
+def atlas_card(atlas, index, code):
+    rect = index["cards"].get(code)
+    if atlas is None or rect is None:
+        return QImage()
+    image = atlas.copy(QRect(*rect))
+    image.setDevicePixelRatio(index["scale"])
+    return image
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Buduje atlasy przeskalowanych kart dla skórek")
+    parser.add_argument("--skin", action="append", help="domyślnie wszystkie skórki")
+    parser.add_argument("--scale", type=float, action="append", help="współczynnik DPI, domyślnie 1 i 2")
+    parser.add_argument("--width", type=int, default=100)
+    parser.add_argument("--height", type=int, default=150)
+    args = parser.parse_args()
+
+    for skin in args.skin or available_skins():
+        for scale in args.scale or [1.0, 2.0]:
+            atlas, index = build_atlas(skin, args.width, args.height, scale)
+            print(f"{skin} @{scale:g}x: {len(index['cards'])} kart, {atlas.width()}x{atlas.height()}")
+
+
+if __name__ == "__main__":
+    main()
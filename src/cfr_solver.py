@@ -0,0 +1,386 @@
+import argparse
+import os
+import pickle
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from src.equity import hand_bucket, hand_value, planned_discard
+from src.table_store import TableStore, write_tables
+
+RAISE_SIZES = (1, 2, 4)
+CHECKPOINT_VERSION = 1
+POLICY_VERSION = 1
+
+
+def history_key(history):
+    return ".".join(history)
+
+
+class AbstractGame:
+    def __init__(self, small_blind=25, big_blind=50, stack_bb=20, raise_sizes=RAISE_SIZES, max_raises=3):
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.stack = stack_bb * big_blind
+        self.raise_sizes = tuple(raise_sizes)
+        self.max_raises = max_raises
+        self.nodes = {}
+        self._build((), 0, (small_blind, big_blind), 0)
+
+    def decision_nodes(self):
+        return {history: node for history, node in self.nodes.items() if "player" in node}
+
+    def _build(self, history, player, contrib, raises):
+        to_call = contrib[1 - player] - contrib[player]
+        actions = []
+        if to_call > 0:
+            actions.append("f")
+        actions.append("c")
+        if raises < self.max_raises:
+            for size in self.raise_sizes:
+                if contrib[1 - player] + size * self.big_blind <= self.stack:
+                    actions.append(f"r{size}")
+
+        children = {}
+        for action in actions:
+            child = history + (action,)
+            children[action] = child
+            if action == "f":
+                self.nodes[child] = {"terminal": "fold", "folder": player, "contrib": contrib}
+            elif action == "c":
+                called = list(contrib)
+                called[player] = contrib[1 - player]
+                if history:
+                    self.nodes[child] = {"terminal": "showdown", "contrib": tuple(called)}
+                else:
+                    self._build(child, 1 - player, tuple(called), raises)
+            else:
+                raised = list(contrib)
+                raised[player] = contrib[1 - player] + int(action[1:]) * self.big_blind
+                self._build(child, 1 - player, tuple(raised), raises + 1)
+
+        self.nodes[history] = {"player": player, "actions": actions, "children": children}
+
+
+def sample_matrix(buckets, trials, seed=None):
+    rng = random.Random(seed)
+    deck = list(range(52))
+    pairs = [0] * (buckets * buckets)
+    points = [0] * (buckets * buckets)
+    for _ in range(trials):
+        cards = rng.sample(deck, 16)
+        first, second, stub = cards[:5], cards[5:10], cards[10:]
+        i = hand_bucket(first, buckets)
+        j = hand_bucket(second, buckets)
+
+        final = []
+        for hand in (first, second):
+            discard = planned_discard(hand)
+            drawn = [stub.pop() for _ in discard]
+            final.append(hand_value([code for k, code in enumerate(hand) if k not in discard] + drawn))
+
+        index = i * buckets + j
+        pairs[index] += 1
+        points[index] += 2 if final[0] > final[1] else 1 if final[0] == final[1] else 0
+    return pairs, points
+
+
+_worker_game = None
+
+
+def _init_worker(game):
+    global _worker_game
+    _worker_game = game
+
+
+def _run_pairs(args):
+    strategies, weights, equities, buckets, chunk = args
+    return walk_pairs(_worker_game, strategies, weights, equities, buckets, chunk)
+
+
+def walk_pairs(game, strategies, weights, equities, buckets, pairs):
+    regrets = {}
+    strategy_sums = {}
+
+    def walk(history, i, j, reach0, reach1, weight):
+        node = game.nodes[history]
+        terminal = node.get("terminal")
+        if terminal == "fold":
+            return -node["contrib"][0] if node["folder"] == 0 else node["contrib"][1]
+        if terminal == "showdown":
+            return (2 * equities[i * buckets + j] - 1) * node["contrib"][0]
+
+        player = node["player"]
+        key = (i if player == 0 else j, history_key(history))
+        actions = node["actions"]
+        strategy = strategies.get(key) or [1 / len(actions)] * len(actions)
+
+        utilities = []
+        value = 0.0
+        for action, probability in zip(actions, strategy):
+            if player == 0:
+                utility = walk(node["children"][action], i, j, reach0 * probability, reach1, weight)
+            else:
+                utility = walk(node["children"][action], i, j, reach0, reach1 * probability, weight)
+            utilities.append(utility)
+            value += probability * utility
+
+        sign = 1 if player == 0 else -1
+        opponent_reach = reach1 if player == 0 else reach0
+        own_reach = reach0 if player == 0 else reach1
+        regret = regrets.setdefault(key, [0.0] * len(actions))
+        total = strategy_sums.setdefault(key, [0.0] * len(actions))
+        for k, utility in enumerate(utilities):
+            regret[k] += sign * (utility - value) * opponent_reach * weight
+            total[k] += own_reach * strategy[k] * weight
+        return value
+
+    for i, j in pairs:
+        walk((), i, j, 1.0, 1.0, weights[i * buckets + j])
+    return regrets, strategy_sums
+
+
+class CfrSolver:
+    def __init__(self, game, buckets=20):
+        self.game = game
+        self.buckets = buckets
+        self.pairs = [0] * (buckets * buckets)
+        self.points = [0] * (buckets * buckets)
+        self.regrets = {}
+        self.strategy_sums = {}
+        self.iteration = 0
+
+    def sample(self, trials, workers=1, chunk_size=20000, seed=None):
+        rng = random.Random(seed)
+        chunks = [min(chunk_size, trials - start) for start in range(0, trials, chunk_size)]
+        seeds = [rng.getrandbits(64) for _ in chunks]
+        if workers <= 1:
+            results = map(sample_matrix, [self.buckets] * len(chunks), chunks, seeds)
+            self._add_samples(results)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                self._add_samples(pool.map(sample_matrix, [self.buckets] * len(chunks), chunks, seeds))
+
+    def _add_samples(self, results):
+        for pairs, points in results:
+            for index in range(len(pairs)):
+                self.pairs[index] += pairs[index]
+                self.points[index] += points[index]
+
+    def equities(self):
+        return [points / (2 * pairs) if pairs else 0.5 for pairs, points in zip(self.pairs, self.points)]
+
+    def weights(self):
+        total = sum(self.pairs) or 1
+        return [pairs / total for pairs in self.pairs]
+
+    def current_strategy(self, key, count):
+        regret = self.regrets.get(key)
+        if regret is None:
+            return [1 / count] * count
+        positive = [max(value, 0.0) for value in regret]
+        total = sum(positive)
+        return [value / total for value in positive] if total > 0 else [1 / count] * count
+
+    def average_strategy(self, key, count):
+        total = self.strategy_sums.get(key)
+        if total is None or sum(total) <= 0:
+            return [1 / count] * count
+        norm = sum(total)
+        return [value / norm for value in total]
+
+    def solve(self, iterations, workers=1, pool=None, checkpoint=None, checkpoint_every=100,
+              time_limit=None, progress=None):
+        weights = self.weights()
+        equities = self.equities()
+        pairs = [(i, j) for i in range(self.buckets) for j in range(self.buckets)
+                 if weights[i * self.buckets + j] > 0]
+        chunks = [pairs[start::workers] for start in range(workers)] if workers > 1 else [pairs]
+        nodes = self.game.decision_nodes()
+        started = time.perf_counter()
+
+        for _ in range(iterations):
+            strategies = {}
+            for history, node in nodes.items():
+                count = len(node["actions"])
+                for bucket in range(self.buckets):
+                    key = (bucket, history_key(history))
+                    if key in self.regrets:
+                        strategies[key] = self.current_strategy(key, count)
+
+            if pool is not None:
+                results = pool.map(_run_pairs, [(strategies, weights, equities, self.buckets, chunk)
+                                                for chunk in chunks])
+            else:
+                results = [walk_pairs(self.game, strategies, weights, equities, self.buckets, chunk)
+                           for chunk in chunks]
+
+            self.iteration += 1
+            for regrets, strategy_sums in results:
+                for key, deltas in regrets.items():
+                    regret = self.regrets.setdefault(key, [0.0] * len(deltas))
+                    for k, delta in enumerate(deltas):
+                        regret[k] = max(regret[k] + delta, 0.0)
+                for key, deltas in strategy_sums.items():
+                    total = self.strategy_sums.setdefault(key, [0.0] * len(deltas))
+                    for k, delta in enumerate(deltas):
+                        total[k] += self.iteration * delta
+
+            if checkpoint and self.iteration % checkpoint_every == 0:
+                self.save_checkpoint(checkpoint)
+            if progress is not None:
+                progress(self)
+            if time_limit is not None and time.perf_counter() - started >= time_limit:
+                break
+
+        if checkpoint:
+            self.save_checkpoint(checkpoint)
+
+    def save_checkpoint(self, path):
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "game": {
+                "small_blind": self.game.small_blind,
+                "big_blind": self.game.big_blind,
+                "stack_bb": self.game.stack // self.game.big_blind,
+                "raise_sizes": self.game.raise_sizes,
+                "max_raises": self.game.max_raises
+            },
+            "buckets": self.buckets,
+            "pairs": self.pairs,
+            "points": self.points,
+            "regrets": self.regrets,
+            "strategy_sums": self.strategy_sums,
+            "iteration": self.iteration
+        }
+        try:
+            with open(path + ".tmp", 'wb') as checkpoint_file:
+                pickle.dump(state, checkpoint_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(path + ".tmp", path)
+        except IOError as e:
+            print(f"Błąd zapisu punktu kontrolnego: {e}")
+            raise
+
+    @classmethod
+    def load_checkpoint(cls, path):
+        with open(path, 'rb') as checkpoint_file:
+            state = pickle.load(checkpoint_file)
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Nieobsługiwana wersja punktu kontrolnego: {state.get('version')}")
+        solver = cls(AbstractGame(**state["game"]), state["buckets"])
+        solver.pairs = state["pairs"]
+        solver.points = state["points"]
+        solver.regrets = state["regrets"]
+        solver.strategy_sums = state["strategy_sums"]
+        solver.iteration = state["iteration"]
+        return solver
+
+    def export_policy(self, path):
+        nodes = sorted(self.game.decision_nodes().items())
+        width = max(len(node["actions"]) for _, node in nodes)
+        policy = array('f')
+        for history, node in nodes:
+            count = len(node["actions"])
+            for bucket in range(self.buckets):
+                strategy = self.average_strategy((bucket, history_key(history)), count)
+                policy.extend(strategy + [0.0] * (width - count))
+
+        meta = {
+            "policy_version": POLICY_VERSION,
+            "buckets": self.buckets,
+            "width": width,
+            "raise_sizes": list(self.game.raise_sizes),
+            "max_raises": self.game.max_raises,
+            "stack_bb": self.game.stack // self.game.big_blind,
+            "iterations": self.iteration,
+            "histories": [history_key(history) for history, _ in nodes],
+            "actions": [node["actions"] for _, node in nodes]
+        }
+        write_tables(path, {"policy": policy}, meta)
+        return PolicyTable(path)
+
+
+class PolicyTable:
+    def __init__(self, path):
+        self.store = TableStore(path)
+        meta = self.store.meta
+        if meta.get("policy_version") != POLICY_VERSION:
+            raise ValueError(f"Nieobsługiwana wersja tabeli strategii: {meta.get('policy_version')}")
+        self.buckets = meta["buckets"]
+        self.width = meta["width"]
+        self.raise_sizes = meta["raise_sizes"]
+        self.iterations = meta["iterations"]
+        self.index = {key: i for i, key in enumerate(meta["histories"])}
+        self.node_actions = meta["actions"]
+        self.policy = self.store.get("policy")
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def actions(self, key):
+        return self.node_actions[self.index[key]]
+
+    def strategy(self, key, bucket):
+        node = self.index.get(key)
+        if node is None:
+            return None
+        start = (node * self.buckets + bucket) * self.width
+        return self.policy[start:start + len(self.node_actions[node])].tolist()
+
+
+def load_policy_table(path):
+    return PolicyTable(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rozwiązuje uproszczoną grę heads-up metodą CFR")
+    parser.add_argument("--buckets", type=int, default=20)
+    parser.add_argument("--samples", type=int, default=500000, help="rozdania do macierzy wygranych")
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--small-blind", type=int, default=25)
+    parser.add_argument("--big-blind", type=int, default=50)
+    parser.add_argument("--stack-bb", type=int, default=20)
+    parser.add_argument("--max-raises", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--checkpoint", default="data/cfr_checkpoint.pkl")
+    parser.add_argument("--checkpoint-every", type=int, default=100)
+    parser.add_argument("--time-limit", type=float, help="limit czasu rozwiązywania w sekundach")
+    parser.add_argument("--output", default="data/cfr_policy.tbl")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    if args.checkpoint and os.path.exists(args.checkpoint):
+        solver = CfrSolver.load_checkpoint(args.checkpoint)
+        print(f"Wznowiono od iteracji {solver.iteration}")
+    else:
+        game = AbstractGame(args.small_blind, args.big_blind, args.stack_bb, max_raises=args.max_raises)
+        solver = CfrSolver(game, args.buckets)
+
+    if not sum(solver.pairs):
+        started = time.perf_counter()
+        solver.sample(args.samples, args.workers, seed=args.seed)
+        print(f"Macierz wygranych: {sum(solver.pairs)} rozdań w {time.perf_counter() - started:.1f}s")
+        if args.checkpoint:
+            solver.save_checkpoint(args.checkpoint)
+
+    started = time.perf_counter()
+
+    def progress(solver):
+        if solver.iteration % 50 == 0:
+            print(f"Iteracja {solver.iteration} ({time.perf_counter() - started:.1f}s)")
+
+    remaining = max(0, args.iterations - solver.iteration)
+    if args.workers > 1:
+        with ProcessPoolExecutor(args.workers, initializer=_init_worker, initargs=(solver.game,)) as pool:
+            solver.solve(remaining, args.workers, pool, args.checkpoint, args.checkpoint_every,
+                         args.time_limit, progress)
+    else:
+        solver.solve(remaining, 1, None, args.checkpoint, args.checkpoint_every, args.time_limit, progress)
+
+    solver.export_policy(args.output)
+    print(f"Zapisano strategię po {solver.iteration} iteracjach do {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import json
+import os
+import threading
+
+PROJECT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.json")
+CARDS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cards")
+CACHE_DIR = os.environ.get("POKER_CACHE_DIR") or os.path.join("data", "cache")
+
+DEFAULT_CONFIG = {
+    "num_bots": 1,
+    "small_blind": 25,
+    "big_blind": 50,
+    "starting_chips": 250,
+    "skin": "Rust",
+    "equity_hud": False,
+    "bot_policy": "default",
+    "bot_deadline_ms": 50,
+    "bot_cache_size": 4096,
+    "bot_cache_file": "",
+    "log_max_lines": 500,
+    "log_spill": False
+}
+
+KEY_ALIASES = {
+    "starting_stack": "starting_chips",
+    "bots": "num_bots",
+    "sb": "small_blind",
+    "bb": "big_blind",
+}
+
+INT_LIMITS = {
+    "num_bots": (0, 3),
+    "small_blind": (1, 1000000),
+    "big_blind": (1, 1000000),
+    "starting_chips": (1, 1000000),
+    "bot_deadline_ms": (1, 5000),
+    "bot_cache_size": (0, 1000000),
+    "log_max_lines": (1, 100000),
+}
+
+
+def normalize_config(data: dict) -> dict:
+    config = dict(DEFAULT_CONFIG)
+    for key, value in (data or {}).items():
+        config[KEY_ALIASES.get(key, key)] = value
+
+    for key, (low, high) in INT_LIMITS.items():
+        try:
+            value = int(config[key])
+        except (TypeError, ValueError):
+            print(f"Niepoprawna wartość '{key}' w konfiguracji, używam domyślnej")
+            value = DEFAULT_CONFIG[key]
+        config[key] = max(low, min(high, value))
+
+    if config["big_blind"] <= config["small_blind"]:
+        print("Big blind musi być większy od small blind, poprawiam konfigurację")
+        config["big_blind"] = config["small_blind"] * 2
+
+    if not os.path.isdir(os.path.join(CARDS_DIR, str(config["skin"]))):
+        print(f"Nieznana skórka kart '{config['skin']}', używam domyślnej")
+        config["skin"] = DEFAULT_CONFIG["skin"]
+
+    return config
+
+
+class ConfigService:
+    def __init__(self, path: str = PROJECT_CONFIG_PATH):
+        self.path = path
+        self._config = None
+        self._mtime = None
+        self._subscribers = []
+        self._lock = threading.RLock()
+
+    def get(self) -> dict:
+        self.check()
+        return dict(self._config)
+
+    def check(self) -> bool:
+        with self._lock:
+            mtime = os.stat(self.path).st_mtime_ns if os.path.exists(self.path) else None
+            if self._config is not None and mtime == self._mtime:
+                return False
+
+            old = self._config
+            self._config = self._read()
+            self._mtime = mtime
+
+        if old is not None:
+            self._notify(old, self._config)
+        return old is not None
+
+    def save(self, config: dict) -> dict:
+        with self._lock:
+            new = normalize_config(config)
+            try:
+                with open(self.path, 'w', encoding='utf-8') as f:
+                    json.dump(new, f, indent=4)
+            except IOError as e:
+                print(f"Błąd zapisu konfiguracji: {e}")
+                raise
+            old = self._config
+            self._config = new
+            self._mtime = os.stat(self.path).st_mtime_ns
+
+        if old is not None:
+            self._notify(old, new)
+        return dict(new)
+
+    def subscribe(self, callback, keys=None) -> None:
+        self._subscribers.append((callback, set(keys) if keys else None))
+
+    def unsubscribe(self, callback) -> None:
+        self._subscribers = [(cb, keys) for cb, keys in self._subscribers if cb != callback]
+
+    def _read(self) -> dict:
+        if not os.path.exists(self.path):
+            return normalize_config({})
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return normalize_config(json.load(f))
+        except (IOError, json.JSONDecodeError) as e:
+            print(f"Błąd odczytu konfiguracji, używam domyślnej: {e}")
+            return dict(self._config) if self._config is not None else normalize_config({})
+
+    def _notify(self, old: dict, new: dict) -> None:
+        changed = {key for key in set(old) | set(new) if old.get(key) != new.get(key)}
+        if not changed:
+            return
+        for callback, keys in list(self._subscribers):
+            if keys is None or keys & changed:
+                callback(dict(new), changed)
+
+
+_services = {}
+
+
+def get_config_service(path: str = PROJECT_CONFIG_PATH) -> ConfigService:
+    path = os.path.abspath(path)
+    if path not in _services:
+        _services[path] = ConfigService(path)
+    return _services[path]
+
+
+def load_config(path: str = PROJECT_CONFIG_PATH) -> dict:
+    return get_config_service(path).get()
+
+
+def save_config(config: dict, path: str = PROJECT_CONFIG_PATH) -> dict:
+    return get_config_service(path).save(config)
@@ -0,0 +1,72 @@
+import json
+import os
+from collections import OrderedDict
+
+
+class DecisionCache:
+    def __init__(self, max_size=4096, path=None):
+        self.max_size = max_size
+        self.path = path
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if self.max_size <= 0:
+            return
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def summary(self):
+        return (f"{len(self.entries)} entries, {self.hits} hits, {self.misses} misses "
+                f"({self.hit_rate():.0%} hit rate)")
+
+    def load(self, path=None) -> int:
+        path = path or self.path
+        if not path or not os.path.exists(path):
+            return 0
+        try:
+            with open(path, 'r', encoding='utf-8') as cache_file:
+                data = json.load(cache_file)
+        except (IOError, json.JSONDecodeError) as e:
+            print(f"Błąd odczytu pamięci decyzji botów: {e}")
+            return 0
+
+        loaded = 0
+        for key, value in data.get("entries", []):
+            self.put(tuple(key), value)
+            loaded += 1
+        return loaded
+
+    def save(self, path=None) -> None:
+        path = path or self.path
+        if not path:
+            return
+        data = {"entries": [[list(key), value] for key, value in self.entries.items()]}
+        try:
+            with open(path + ".tmp", 'w', encoding='utf-8') as cache_file:
+                json.dump(data, cache_file, separators=(',', ':'))
+            os.replace(path + ".tmp", path)
+        except IOError as e:
+            print(f"Błąd zapisu pamięci decyzji botów: {e}")
+            raise
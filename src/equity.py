@@ -0,0 +1,460 @@
+import argparse
+import math
+import os
+import random
+import time
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import combinations, combinations_with_replacement
+
+import numpy as np
+
+from src.card import Card
+from src.config import CACHE_DIR
+from src.table_store import TableStore, write_tables
+from src.utils import evaluate_hand
+
+MAX_DISCARD = 3
+
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+SUITS = ['s', 'h', 'd', 'c']
+RANK_PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]
+
+CARD_PRIMES = [RANK_PRIMES[code >> 2] for code in range(52)]
+CARD_SUIT_BITS = [1 << (code & 3) for code in range(52)]
+
+EVALUATOR_TABLE_PATH = os.path.join(CACHE_DIR, "evaluator.tbl")
+EVALUATOR_VERSION = 1
+
+_tables = None
+_percentiles = None
+
+
+def encode_card(card):
+    return RANKS.index(card.rank) * 4 + SUITS.index(card.suit)
+
+
+def decode_card(code):
+    return Card(RANKS[code >> 2], SUITS[code & 3])
+
+
+def parse_card(text):
+    return Card(text[:-1].upper(), text[-1].lower())
+
+
+def remaining_codes(dead_codes):
+    dead = set(dead_codes)
+    return [code for code in range(52) if code not in dead]
+
+
+def discard_options(max_discard=MAX_DISCARD):
+    options = []
+    for count in range(max_discard + 1):
+        options.extend(combinations(range(5), count))
+    return options
+
+
+def native_view(values):
+    if not values.dtype.isnative:
+        return values
+    return memoryview(values).cast('B').cast(values.dtype.char)
+
+
+class ValueTable:
+    def __init__(self, keys, values):
+        self.keys = keys
+        self.values = values
+        self._keys = native_view(keys)
+        self._values = native_view(values)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __getitem__(self, product):
+        index = bisect_left(self._keys, product)
+        if index == len(self._keys) or self._keys[index] != product:
+            raise KeyError(product)
+        return int(self._values[index])
+
+    def lookup(self, products):
+        indices = np.minimum(self.keys.searchsorted(products), len(self.keys) - 1)
+        return self.values[indices]
+
+    @classmethod
+    def from_dict(cls, values):
+        keys = sorted(values)
+        return cls(np.array(keys, dtype=np.uint32), np.array([values[key] for key in keys], dtype=np.uint16))
+
+
+def build_tables():
+    flush_hands = {}
+    hands = {}
+    for ranks in combinations_with_replacement(range(13), 5):
+        if max(ranks.count(rank) for rank in ranks) > 4:
+            continue
+        product = math.prod(RANK_PRIMES[rank] for rank in ranks)
+        suits = [SUITS[i % 2] for i in range(5)]
+        hands[product] = evaluate_hand([Card(RANKS[rank], suit) for rank, suit in zip(ranks, suits)])
+        if len(set(ranks)) == 5:
+            flush_hands[product] = evaluate_hand([Card(RANKS[rank], 's') for rank in ranks])
+
+    order = sorted({(rank, tuple(tiebreakers)) for rank, tiebreakers in list(hands.values()) + list(flush_hands.values())})
+    values = {key: value for value, key in enumerate(order)}
+    flush_values = {product: values[(rank, tuple(tb))] for product, (rank, tb) in flush_hands.items()}
+    hand_values = {product: values[(rank, tuple(tb))] for product, (rank, tb) in hands.items()}
+    categories = [rank for rank, _ in order]
+    return flush_values, hand_values, categories
+
+
+def value_counts(tables=None):
+    flush_values, hand_values, categories = tables or get_tables()
+    counts = [0] * len(categories)
+    for ranks in combinations_with_replacement(range(13), 5):
+        multiplicities = [ranks.count(rank) for rank in set(ranks)]
+        if max(multiplicities) > 4:
+            continue
+        product = math.prod(RANK_PRIMES[rank] for rank in ranks)
+        suited = math.prod(math.comb(4, count) for count in multiplicities)
+        if len(multiplicities) == 5:
+            counts[flush_values[product]] += 4
+            suited -= 4
+        counts[hand_values[product]] += suited
+    return counts
+
+
+def value_percentiles(counts):
+    total = sum(counts)
+    below = 0
+    percentiles = []
+    for count in counts:
+        percentiles.append((below + count / 2) / total)
+        below += count
+    return percentiles
+
+
+def build_evaluator_store(path=EVALUATOR_TABLE_PATH):
+    tables = build_tables()
+    flush_values, hand_values, categories = tables
+    flush_keys = sorted(flush_values)
+    hand_keys = sorted(hand_values)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_tables(path, {
+        "flush_keys": array('I', flush_keys),
+        "flush_values": array('H', [flush_values[key] for key in flush_keys]),
+        "hand_keys": array('I', hand_keys),
+        "hand_values": array('H', [hand_values[key] for key in hand_keys]),
+        "categories": array('B', categories),
+        "percentiles": array('d', value_percentiles(value_counts(tables)))
+    }, meta={"evaluator_version": EVALUATOR_VERSION})
+    return tables
+
+
+def load_evaluator_store(path=EVALUATOR_TABLE_PATH):
+    try:
+        store = TableStore(path)
+        if store.meta.get("evaluator_version") == EVALUATOR_VERSION:
+            return store
+    except (IOError, ValueError, KeyError):
+        pass
+
+    try:
+        build_evaluator_store(path)
+        return TableStore(path)
+    except (IOError, OSError) as e:
+        print(f"Nie można zapisać tablic ewaluatora, liczę je w pamięci: {e}")
+        return None
+
+
+def get_tables():
+    global _tables, _percentiles
+    if _tables is None:
+        store = load_evaluator_store()
+        if store is None:
+            tables = build_tables()
+            flush_values, hand_values, categories = tables
+            _percentiles = np.array(value_percentiles(value_counts(tables)))
+            _tables = (ValueTable.from_dict(flush_values), ValueTable.from_dict(hand_values),
+                       np.array(categories, dtype=np.uint8))
+        else:
+            _tables = (
+                ValueTable(store.get("flush_keys"), store.get("flush_values")),
+                ValueTable(store.get("hand_keys"), store.get("hand_values")),
+                store.get("categories")
+            )
+            _percentiles = store.get("percentiles")
+    return _tables
+
+
+def get_percentiles():
+    get_tables()
+    return _percentiles
+
+
+def hand_percentile(codes):
+    return float(get_percentiles()[hand_value(codes)])
+
+
+def hand_value(codes):
+    flush_values, hand_values, _ = get_tables()
+    a, b, c, d, e = codes
+    product = CARD_PRIMES[a] * CARD_PRIMES[b] * CARD_PRIMES[c] * CARD_PRIMES[d] * CARD_PRIMES[e]
+    if CARD_SUIT_BITS[a] & CARD_SUIT_BITS[b] & CARD_SUIT_BITS[c] & CARD_SUIT_BITS[d] & CARD_SUIT_BITS[e]:
+        return flush_values[product]
+    return hand_values[product]
+
+
+def value_category(value):
+    return int(get_tables()[2][value])
+
+
+def lookup_values(products, flushes):
+    flush_values, hand_values, _ = get_tables()
+    products = np.asarray(products, dtype=np.uint32)
+    return np.where(np.asarray(flushes, dtype=bool), flush_values.lookup(products), hand_values.lookup(products))
+
+
+def batch_values(hands):
+    primes = CARD_PRIMES
+    bits = CARD_SUIT_BITS
+    products = [primes[a] * primes[b] * primes[c] * primes[d] * primes[e] for a, b, c, d, e in hands]
+    flushes = [bits[a] & bits[b] & bits[c] & bits[d] & bits[e] for a, b, c, d, e in hands]
+    return lookup_values(products, flushes)
+
+
+def batch_percentiles(hands):
+    return get_percentiles()[batch_values(hands)].tolist()
+
+
+def batch_categories(hands):
+    return get_tables()[2][batch_values(hands)].tolist()
+
+
+def keep_order(codes):
+    counts = {}
+    for code in codes:
+        counts[code >> 2] = counts.get(code >> 2, 0) + 1
+    return sorted(codes, key=lambda code: (counts[code >> 2], code >> 2), reverse=True)
+
+
+def planned_discard(codes, category=None):
+    if category is None:
+        category = value_category(hand_value(codes))
+    if category >= 4:
+        return ()
+    counts = {}
+    for code in codes:
+        counts[code >> 2] = counts.get(code >> 2, 0) + 1
+    singles = sorted((code >> 2, i) for i, code in enumerate(codes) if counts[code >> 2] == 1)
+    return tuple(sorted(i for _, i in singles[:MAX_DISCARD]))
+
+
+def hand_bucket(codes, buckets):
+    return min(int(hand_percentile(codes) * buckets), buckets - 1)
+
+
+def simulate(hero, stub, draw_counts, discard=(), trials=1000, seed=None):
+    primes = CARD_PRIMES
+    bits = CARD_SUIT_BITS
+    rng = random.Random(seed)
+    sample = rng.sample
+
+    kept = [code for i, code in enumerate(hero) if i not in discard]
+    hero_draw = len(discard)
+    needed = hero_draw + sum(5 + count for count in draw_counts)
+
+    products = array('I')
+    flushes = array('B')
+    append_product = products.append
+    append_flush = flushes.append
+
+    def add(a, b, c, d, e):
+        append_product(primes[a] * primes[b] * primes[c] * primes[d] * primes[e])
+        append_flush(bits[a] & bits[b] & bits[c] & bits[d] & bits[e])
+
+    if not hero_draw:
+        add(*hero)
+    for _ in range(trials):
+        cards = sample(stub, needed)
+        if hero_draw:
+            add(*(kept + cards[:hero_draw]))
+
+        position = hero_draw
+        for count in draw_counts:
+            hand = cards[position:position + 5]
+            if count:
+                hand = keep_order(hand)[:5 - count] + cards[position + 5:position + 5 + count]
+            position += 5 + count
+            add(*hand)
+
+    if not trials:
+        return 0, 0, 0
+    values = lookup_values(products, flushes)
+    if hero_draw:
+        values = values.reshape(trials, 1 + len(draw_counts))
+        mine = values[:, 0]
+        best = values[:, 1:].max(axis=1)
+    else:
+        mine = values[0]
+        best = values[1:].reshape(trials, len(draw_counts)).max(axis=1)
+    wins = int((mine > best).sum())
+    ties = int((mine == best).sum())
+    return wins, ties, trials - wins - ties
+
+
+class EquityResult:
+    def __init__(self, wins=0, ties=0, losses=0, elapsed=0.0):
+        self.wins = wins
+        self.ties = ties
+        self.losses = losses
+        self.elapsed = elapsed
+
+    def add(self, wins, ties, losses):
+        self.wins += wins
+        self.ties += ties
+        self.losses += losses
+
+    def trials(self):
+        return self.wins + self.ties + self.losses
+
+    def win_rate(self):
+        return self.wins / self.trials() if self.trials() else 0.0
+
+    def tie_rate(self):
+        return self.ties / self.trials() if self.trials() else 0.0
+
+    def loss_rate(self):
+        return self.losses / self.trials() if self.trials() else 0.0
+
+    def equity(self):
+        return (self.wins + self.ties / 2) / self.trials() if self.trials() else 0.0
+
+    def margin(self, z=1.96):
+        trials = self.trials()
+        if not trials:
+            return 1.0
+        equity = self.equity()
+        return z * math.sqrt(max(equity * (1 - equity), 1 / trials) / trials)
+
+    def trials_per_second(self):
+        return self.trials() / self.elapsed if self.elapsed else 0.0
+
+    def to_tuple(self):
+        return self.wins, self.ties, self.losses
+
+    def __str__(self):
+        return (f"Win: {self.win_rate():.1%} | Tie: {self.tie_rate():.1%} | Loss: {self.loss_rate():.1%} | "
+                f"Equity: {self.equity():.1%} ± {self.margin():.1%} ({self.trials()} trials, "
+                f"{self.trials_per_second():.0f}/s)")
+
+
+def calculate_equity(hand, opponents=1, dead_cards=(), draw_counts=None, discard=(),
+                     max_trials=100000, time_budget=None, target_margin=None,
+                     workers=1, chunk_size=2000, seed=None):
+    if draw_counts is None:
+        draw_counts = [0] * opponents
+    draw_counts = [max(0, min(count, MAX_DISCARD)) for count in draw_counts][:opponents]
+    draw_counts += [0] * (opponents - len(draw_counts))
+
+    hero = [encode_card(card) for card in hand]
+    stub = remaining_codes(hero + [encode_card(card) for card in dead_cards])
+    if len(discard) + sum(5 + count for count in draw_counts) > len(stub):
+        raise ValueError("Za mało kart w talii dla tylu przeciwników")
+
+    rng = random.Random(seed)
+    result = EquityResult()
+    start = time.perf_counter()
+
+    def finished():
+        if result.trials() >= max_trials:
+            return True
+        if time_budget is not None and time.perf_counter() - start >= time_budget:
+            return True
+        return target_margin is not None and result.trials() >= chunk_size and result.margin() <= target_margin
+
+    if workers <= 1:
+        while not finished():
+            trials = min(chunk_size, max_trials - result.trials())
+            result.add(*simulate(hero, stub, draw_counts, discard, trials, rng.getrandbits(64)))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            submitted = 0
+            while True:
+                while not finished() and submitted < max_trials and len(pending) < workers * 2:
+                    trials = min(chunk_size, max_trials - submitted)
+                    pending.add(pool.submit(simulate, hero, stub, draw_counts, discard, trials, rng.getrandbits(64)))
+                    submitted += trials
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result.add(*future.result())
+                if finished():
+                    for future in pending:
+                        future.cancel()
+                    break
+
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+class EquitySampler:
+    def __init__(self, hand, opponents, dead_cards=(), can_draw=True, draw_counts=None, rng=None):
+        self.hand = list(hand)
+        self.opponents = opponents
+        self.draw_counts = list(draw_counts) if draw_counts is not None else [0] * opponents
+        self.codes = [encode_card(card) for card in self.hand]
+        self.stub = remaining_codes(self.codes + [encode_card(card) for card in dead_cards])
+        self.options = discard_options() if can_draw else [()]
+        self.tallies = {option: EquityResult() for option in self.options}
+        self.rng = rng or random.Random()
+
+    def run(self, trials):
+        for option in self.options:
+            self.tallies[option].add(*simulate(self.codes, self.stub, self.draw_counts, option,
+                                               trials, self.rng.getrandbits(64)))
+
+    def trials(self):
+        return self.tallies[()].trials()
+
+    def best_option(self):
+        return max(self.options, key=lambda option: self.tallies[option].equity())
+
+    def snapshot(self):
+        best = self.best_option()
+        return {
+            "opponents": self.opponents,
+            "trials": self.trials(),
+            "can_draw": len(self.options) > 1,
+            "current": self.tallies[()].to_tuple(),
+            "best_discard": [self.hand[i] for i in best],
+            "best": self.tallies[best].to_tuple()
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Szacuje equity ręki w five card draw metodą Monte Carlo")
+    parser.add_argument("cards", nargs=5, help="np. AS KS 10H 10D 2C")
+    parser.add_argument("--opponents", type=int, default=1)
+    parser.add_argument("--draws", type=int, nargs="*", help="liczba wymienionych kart dla każdego przeciwnika")
+    parser.add_argument("--discard", type=int, nargs="*", default=[], help="indeksy kart do wymiany (0-4)")
+    parser.add_argument("--dead", nargs="*", default=[])
+    parser.add_argument("--trials", type=int, default=200000)
+    parser.add_argument("--budget", type=float, help="limit czasu w sekundach")
+    parser.add_argument("--margin", type=float, help="zakończ, gdy przedział ufności 95%% jest węższy")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    result = calculate_equity(
+        [parse_card(text) for text in args.cards], args.opponents,
+        dead_cards=[parse_card(text) for text in args.dead], draw_counts=args.draws,
+        discard=tuple(args.discard), max_trials=args.trials, time_budget=args.budget,
+        target_margin=args.margin, workers=args.workers, seed=args.seed
+    )
+    print(result)
+
+
+if __name__ == "__main__":
+    main()
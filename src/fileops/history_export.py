@@ -0,0 +1,164 @@
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+from array import array
+
+from ..card import Card
+from ..utils import evaluate_hand
+from .session_manager import SessionManager
+
+
+NUMERIC_COLUMNS = {
+    "game_id": 'q',
+    "round": 'q',
+    "amount": 'q',
+    "pot": 'q',
+    "final_category": 'b',
+    "chips_won": 'q',
+}
+LABEL_COLUMNS = ("player", "stage", "action")
+COLUMNS = ("game_id", "round", "player", "stage", "action", "amount", "pot", "final_category", "chips_won")
+
+NPY_DESCR = {'q': '<i8', 'i': '<i4', 'b': '|i1'}
+
+
+def _npy_header(descr, length):
+    header = "{'descr': '%s', 'fortran_order': False, 'shape': (%d,), }" % (descr, length)
+    padding = 64 - (10 + len(header) + 1) % 64
+    header = header + ' ' * (padding % 64) + '\n'
+    return b'\x93NUMPY\x01\x00' + len(header).to_bytes(2, 'little') + header.encode('latin1')
+
+
+def _card_from_str(text):
+    return Card(text[:-1], text[-1])
+
+
+def _final_categories(entry):
+    categories = {}
+    for player_id, cards in entry.get("hands", {}).items():
+        if len(cards) == 5:
+            categories[int(player_id)] = evaluate_hand([_card_from_str(c) for c in cards])[0]
+    return categories
+
+
+def _infer_winner(entry, categories):
+    if entry.get("winner") is not None:
+        return int(entry["winner"])
+
+    folded = {bet["player_id"] for bet in entry.get("bets", []) if bet.get("action") == 'fold'}
+    best = None
+    for player_id, cards in entry.get("hands", {}).items():
+        player_id = int(player_id)
+        if player_id in folded or player_id not in categories:
+            continue
+        score = evaluate_hand([_card_from_str(c) for c in cards])
+        if best is None or score > best[0]:
+            best = (score, player_id)
+    return best[1] if best else None
+
+
+class HistoryExporter:
+    def __init__(self, data_dir: str = 'data', chunk_size: int = 65536):
+        self.session_manager = SessionManager(data_dir)
+        self.chunk_size = chunk_size
+
+    def iter_rows(self, game_id=None):
+        rounds = {}
+        for entry in self.session_manager.iter_hand_history(game_id):
+            entry_game_id = int(entry.get("game_id") or 0)
+            rounds[entry_game_id] = rounds.get(entry_game_id, 0) + 1
+
+            names = {p["id"]: p["name"] for p in entry.get("players", [])}
+            categories = _final_categories(entry)
+            winner = _infer_winner(entry, categories)
+            pot = entry.get("pot", 0)
+
+            for bet in entry.get("bets", []):
+                player_id = bet.get("player_id")
+                yield (
+                    entry_game_id,
+                    rounds[entry_game_id],
+                    names.get(player_id, str(player_id)),
+                    bet.get("stage", "unknown"),
+                    bet.get("action") or "unknown",
+                    bet.get("amount", 0),
+                    bet.get("pot", 0),
+                    categories.get(player_id, -1),
+                    pot if player_id == winner else 0,
+                )
+
+    def export(self, output_path: str, game_id=None, compress: bool = False) -> int:
+        labels = {column: {} for column in LABEL_COLUMNS}
+        typecodes = dict(NUMERIC_COLUMNS, **{column: 'i' for column in LABEL_COLUMNS})
+        buffers = {column: array(typecodes[column]) for column in COLUMNS}
+        rows = 0
+
+        temp_dir = tempfile.mkdtemp(prefix="history_export_")
+        try:
+            column_files = {column: open(os.path.join(temp_dir, column), 'wb') for column in COLUMNS}
+            try:
+                for row in self.iter_rows(game_id):
+                    for column, value in zip(COLUMNS, row):
+                        if column in labels:
+                            value = labels[column].setdefault(value, len(labels[column]))
+                        buffers[column].append(value)
+                    rows += 1
+                    if rows % self.chunk_size == 0:
+                        self._flush(buffers, column_files)
+                self._flush(buffers, column_files)
+            finally:
+                for column_file in column_files.values():
+                    column_file.close()
+
+            compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+            with zipfile.ZipFile(output_path, 'w', compression=compression, allowZip64=True) as archive:
+                for column in COLUMNS:
+                    with archive.open(f"{column}.npy", 'w', force_zip64=True) as member, \
+                            open(os.path.join(temp_dir, column), 'rb') as column_file:
+                        member.write(_npy_header(NPY_DESCR[typecodes[column]], rows))
+                        shutil.copyfileobj(column_file, member)
+                for column in LABEL_COLUMNS:
+                    archive.writestr(f"{column}_labels.npy", self._labels_npy(labels[column]))
+        except IOError as e:
+            print(f"Błąd eksportu historii: {e}")
+            raise
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+        return rows
+
+    def _flush(self, buffers, column_files):
+        for column, buffer in buffers.items():
+            if not buffer:
+                continue
+            if sys.byteorder != 'little':
+                buffer.byteswap()
+            buffer.tofile(column_files[column])
+            del buffer[:]
+
+    def _labels_npy(self, mapping):
+        values = sorted(mapping, key=mapping.get)
+        width = max((len(value) for value in values), default=1)
+        body = b''.join(value.ljust(width, '\0').encode('utf-32-le') for value in values)
+        return _npy_header(f'<U{width}', len(values)) + body
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Eksport historii rozdań do kolumnowego pliku .npz")
+    parser.add_argument("output", help="ścieżka pliku wynikowego (.npz)")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--game-id", default=None)
+    parser.add_argument("--chunk-size", type=int, default=65536)
+    parser.add_argument("--compress", action="store_true")
+    args = parser.parse_args()
+
+    exporter = HistoryExporter(args.data_dir, args.chunk_size)
+    rows = exporter.export(args.output, args.game_id, args.compress)
+    print(f"Wyeksportowano {rows} wierszy do {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import argparse
+import json
+import os
+import time
+import zipfile
+
+
+SESSION_SUFFIXES = (".json", "_delta.jsonl", "_log.jsonl", "_messages.log")
+
+
+class SessionArchive:
+    def __init__(self, data_dir: str = 'data', archive_dir: str = 'archive'):
+        self.data_dir = data_dir
+        self.archive_dir = os.path.join(data_dir, archive_dir)
+        self.index_path = os.path.join(self.archive_dir, "index.json")
+        self._index = None
+        self._index_mtime = None
+        self._segments = {}
+
+    def game_ids(self):
+        return [int(game_id) for game_id in self._load_index()["games"]]
+
+    def contains(self, game_id) -> bool:
+        return str(game_id) in self._load_index()["games"]
+
+    def read(self, game_id, suffix: str):
+        segment = self._load_index()["games"].get(str(game_id))
+        if segment is None:
+            return None
+        try:
+            return self._segment(segment).read(f"session_{game_id}{suffix}").decode('utf-8')
+        except KeyError:
+            return None
+
+    def compact(self, session_manager, segment_size: int = 500, min_age: float = 3600) -> int:
+        now = time.time()
+        candidates = []
+        for game_id in session_manager.list_game_ids():
+            paths = self._loose_paths(game_id)
+            if not paths or any(now - os.path.getmtime(path) < min_age for path in paths):
+                continue
+            candidates.append(game_id)
+
+        index = self._load_index()
+        archived = 0
+        for start in range(0, len(candidates), segment_size):
+            batch = candidates[start:start + segment_size]
+            for game_id in batch:
+                if os.path.exists(os.path.join(self.data_dir, f"session_{game_id}.json")):
+                    session_manager.compact(game_id)
+
+            segment = f"segment_{len(index['segments']) + 1:05d}.zip"
+            segment_path = os.path.join(self.archive_dir, segment)
+            os.makedirs(self.archive_dir, exist_ok=True)
+            try:
+                with zipfile.ZipFile(segment_path + ".tmp", 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+                    for game_id in batch:
+                        for suffix in SESSION_SUFFIXES:
+                            content = self._merged_content(game_id, suffix)
+                            if content:
+                                zf.writestr(f"session_{game_id}{suffix}", content)
+                os.replace(segment_path + ".tmp", segment_path)
+            except IOError as e:
+                print(f"Błąd zapisu archiwum: {e}")
+                raise
+
+            index["segments"][segment] = batch
+            for game_id in batch:
+                index["games"][str(game_id)] = segment
+            self._write_index(index)
+
+            for game_id in batch:
+                for path in self._loose_paths(game_id):
+                    os.remove(path)
+            archived += len(batch)
+
+        return archived
+
+    def close(self):
+        for segment in self._segments.values():
+            segment.close()
+        self._segments = {}
+
+    def _merged_content(self, game_id, suffix):
+        loose_path = os.path.join(self.data_dir, f"session_{game_id}{suffix}")
+        loose = None
+        if os.path.exists(loose_path):
+            with open(loose_path, 'r', encoding='utf-8') as file:
+                loose = file.read()
+
+        if suffix in ("_log.jsonl", "_messages.log"):
+            return (self.read(game_id, suffix) or "") + (loose or "")
+        if suffix == ".json" and loose is None:
+            return self.read(game_id, suffix)
+        return loose
+
+    def _loose_paths(self, game_id):
+        paths = [os.path.join(self.data_dir, f"session_{game_id}{suffix}") for suffix in SESSION_SUFFIXES]
+        return [path for path in paths if os.path.exists(path)]
+
+    def _segment(self, segment):
+        if segment not in self._segments:
+            self._segments[segment] = zipfile.ZipFile(os.path.join(self.archive_dir, segment), 'r')
+        return self._segments[segment]
+
+    def _load_index(self):
+        mtime = os.path.getmtime(self.index_path) if os.path.exists(self.index_path) else None
+        if self._index is not None and mtime == self._index_mtime:
+            return self._index
+
+        self.close()
+        if mtime is None:
+            self._index = {"segments": {}, "games": {}}
+        else:
+            with open(self.index_path, 'r', encoding='utf-8') as index_file:
+                self._index = json.load(index_file)
+        self._index_mtime = mtime
+        return self._index
+
+    def _write_index(self, index):
+        try:
+            with open(self.index_path + ".tmp", 'w', encoding='utf-8') as index_file:
+                json.dump(index, index_file, separators=(',', ':'))
+            os.replace(self.index_path + ".tmp", self.index_path)
+        except IOError as e:
+            print(f"Błąd zapisu indeksu archiwum: {e}")
+            raise
+        self._index = index
+        self._index_mtime = os.path.getmtime(self.index_path)
+
+
+def main():
+    from .session_manager import SessionManager
+
+    parser = argparse.ArgumentParser(description="Scala pliki sesji z katalogu data/ w skompresowane archiwa")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--segment-size", type=int, default=500)
+    parser.add_argument("--min-age", type=float, default=3600,
+                        help="pomiń sesje modyfikowane w ciągu ostatnich N sekund")
+    args = parser.parse_args()
+
+    session_manager = SessionManager(args.data_dir)
+    archived = session_manager.archive.compact(session_manager, args.segment_size, args.min_age)
+    print(f"Zarchiwizowano {archived} sesji")
+
+
+if __name__ == "__main__":
+    main()
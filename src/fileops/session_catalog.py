@@ -0,0 +1,109 @@
+import json
+import os
+from datetime import datetime
+
+
+class SessionCatalog:
+    def __init__(self, data_dir: str = 'data', filename: str = 'catalog.jsonl'):
+        self.data_dir = data_dir
+        self.path = os.path.join(data_dir, filename)
+        self._entries = None
+        self._lines = 0
+
+    def update(self, game_id: int, players, rounds: int, timestamp: str = None) -> dict:
+        entry = {
+            "game_id": int(game_id),
+            "timestamp": timestamp or datetime.now().isoformat(timespec="seconds"),
+            "players": [player.get_name() for player in players],
+            "stacks": [player.get_stack_amount() for player in players],
+            "rounds": rounds
+        }
+
+        try:
+            with open(self.path, 'a', encoding='utf-8') as catalog_file:
+                catalog_file.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        except IOError as e:
+            print(f"Błąd zapisu katalogu sesji: {e}")
+            raise
+
+        if self._entries is not None:
+            self._entries[entry["game_id"]] = entry
+            self._lines += 1
+            self._compact_if_needed()
+        return entry
+
+    def get(self, game_id):
+        return self._load().get(int(game_id))
+
+    def game_ids(self):
+        return list(self._load())
+
+    def entries(self, query: str = ""):
+        query = query.strip().lower()
+        entries = sorted(self._load().values(), key=lambda e: e["game_id"], reverse=True)
+        if not query:
+            return entries
+        return [entry for entry in entries if query in self._search_text(entry)]
+
+    def rebuild(self, session_manager) -> None:
+        entries = {}
+        for game_id in session_manager.list_game_ids():
+            try:
+                session = session_manager.load_session(game_id)
+            except (IOError, ValueError):
+                continue
+            path = os.path.join(self.data_dir, f"session_{game_id}.json")
+            timestamp = datetime.fromtimestamp(os.path.getmtime(path)).isoformat(timespec="seconds") \
+                if os.path.exists(path) else None
+            entries[int(game_id)] = {
+                "game_id": int(game_id),
+                "timestamp": timestamp,
+                "players": [player.get_name() for player in session["players"]],
+                "stacks": [player.get_stack_amount() for player in session["players"]],
+                "rounds": session.get("rounds", 0)
+            }
+        self._entries = entries
+        self._rewrite()
+
+    def _search_text(self, entry):
+        return " ".join([str(entry["game_id"]), entry.get("timestamp") or ""] + entry["players"]).lower()
+
+    def _load(self):
+        if self._entries is not None:
+            return self._entries
+
+        entries = {}
+        lines = 0
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as catalog_file:
+                for line in catalog_file:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    entries[entry["game_id"]] = entry
+                    lines += 1
+
+        self._entries = entries
+        self._lines = lines
+        self._compact_if_needed()
+        return entries
+
+    def _compact_if_needed(self):
+        if self._lines > 2 * len(self._entries) + 100:
+            self._rewrite()
+
+    def _rewrite(self):
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as catalog_file:
+                for entry in sorted(self._entries.values(), key=lambda e: e["game_id"]):
+                    catalog_file.write(json.dumps(entry, separators=(',', ':')) + '\n')
+            os.replace(tmp_path, self.path)
+        except IOError as e:
+            print(f"Błąd zapisu katalogu sesji: {e}")
+            raise
+        self._lines = len(self._entries)
@@ -6,15 +6,24 @@ from typing import List
 from ..card import Card
 from ..player import Player
 from ..deck import Deck
+from ..opponent_model import OpponentModel
+from ..config import get_config_service
+from .session_catalog import SessionCatalog
+from .session_archive import SessionArchive
 
 
 class SessionManager:
-    def __init__(self, data_dir: str = 'data'):
+    def __init__(self, data_dir: str = 'data', snapshot_interval: int = 20):
         self.data_dir = data_dir
+        self.snapshot_interval = snapshot_interval
+        self._snapshot_base = {}
         os.makedirs(self.data_dir, exist_ok=True)
+        self.catalog = SessionCatalog(self.data_dir)
+        self.archive = SessionArchive(self.data_dir)
+        self._catalog_synced = False
 
-    def _get_next_game_id(self) -> int:
-        existing_ids = []
+    def list_game_ids(self) -> List[int]:
+        existing_ids = self.archive.game_ids()
         for filename in os.listdir(self.data_dir):
             if filename.startswith("session_") and filename.endswith(".json"):
                 try:
@@ -22,12 +31,28 @@ class SessionManager:
                     existing_ids.append(int(num_part))
                 except ValueError:
                     continue
-        return max(existing_ids, default=0) + 1
+        return sorted(set(existing_ids))
+
+    def _get_next_game_id(self) -> int:
+        return max(self.list_game_ids(), default=0) + 1
+
+    def list_sessions(self, query: str = "") -> List[dict]:
+        if not self._catalog_synced:
+            self._sync_catalog()
+        return self.catalog.entries(query)
+
+    def _sync_catalog(self) -> None:
+        self._catalog_synced = True
+        if set(self.list_game_ids()) - set(self.catalog.game_ids()):
+            self.catalog.rebuild(self)
 
     def save_session(self, session: dict) -> None:
         if not session.get("completed_round", False):
             raise ValueError("Zapis sesji możliwy tylko po zakończonej rundzie.")
 
+        if not self._catalog_synced:
+            self._sync_catalog()
+
         game_id = session.get("game_id")
         if not game_id:
             game_id = self._get_next_game_id()
@@ -35,22 +60,78 @@ class SessionManager:
 
         self._save_game_state(session, game_id)
         self._append_hand_history(session, game_id)
+        self.catalog.update(game_id, session.get("players", []), self._snapshot_base[game_id]["rounds"])
 
     def _save_game_state(self, session: dict, game_id: int) -> None:
+        players = session.get("players", [])
+        names = [player.get_name() for player in players]
+        stacks = [player.get_stack_amount() for player in players]
+        base = self._snapshot_base.get(game_id)
+
+        if base is None:
+            snapshot_path = os.path.join(self.data_dir, f"session_{game_id}.json")
+            exists = os.path.exists(snapshot_path) or self.archive.contains(game_id)
+            rounds = self.load_session(game_id).get("rounds", 0) + 1 if exists else 1
+        else:
+            rounds = base["rounds"] + 1
+
+        if base is None or base["names"] != names or base["deltas"] >= self.snapshot_interval:
+            self._write_snapshot(session, game_id, rounds)
+            return
+
+        delta = {
+            "round": rounds,
+            "stacks": {str(idx): stack for idx, stack in enumerate(stacks) if stack != base["stacks"][idx]},
+            "result": {"winner": session.get("winner_id"), "pot": session.get("pot", 0)},
+        }
+        if session.get("opponent_stats") is not None:
+            delta["opponent_stats"] = session["opponent_stats"].pop_changes()
+
+        filename = os.path.join(self.data_dir, f"session_{game_id}_delta.jsonl")
+        try:
+            with open(filename, 'a', encoding='utf-8') as delta_file:
+                delta_file.write(json.dumps(delta, separators=(',', ':')) + '\n')
+        except IOError as e:
+            print(f"Błąd zapisu pliku: {e}")
+            raise
+
+        base.update(stacks=stacks, rounds=rounds, deltas=base["deltas"] + 1)
+
+    def _write_snapshot(self, session: dict, game_id: int, rounds: int) -> None:
+        players = session.get("players", [])
         serializable_state = {
             "game_id": game_id,
-            "players": [player.to_dict() for player in session.get("players", [])],
+            "rounds": rounds,
+            "players": [player.to_dict() for player in players],
             "deck": session.get("deck").to_dict() if session.get("deck") else {},
         }
+        if session.get("opponent_stats") is not None:
+            serializable_state["opponent_stats"] = session["opponent_stats"].to_dict()
+            session["opponent_stats"].pop_changes()
 
         filename = os.path.join(self.data_dir, f"session_{game_id}.json")
+        delta_filename = os.path.join(self.data_dir, f"session_{game_id}_delta.jsonl")
         try:
-            with open(filename, 'w', encoding='utf-8') as file:
-                json.dump(serializable_state, file, indent=2)
+            with open(filename + ".tmp", 'w', encoding='utf-8') as file:
+                json.dump(serializable_state, file, separators=(',', ':'))
+            os.replace(filename + ".tmp", filename)
+            if os.path.exists(delta_filename):
+                os.remove(delta_filename)
         except IOError as e:
             print(f"Błąd zapisu pliku: {e}")
             raise
 
+        self._snapshot_base[game_id] = {
+            "names": [player.get_name() for player in players],
+            "stacks": [player.get_stack_amount() for player in players],
+            "rounds": rounds,
+            "deltas": 0,
+        }
+
+    def compact(self, game_id) -> None:
+        session = self.load_session(game_id)
+        self._write_snapshot(session, int(session["game_id"]), session["rounds"])
+
     def _append_hand_history(self, session: dict, game_id: int) -> None:
         log_entry = {
             "game_id": str(game_id),
@@ -67,7 +148,8 @@ class SessionManager:
             },
             "bets": session.get("bets", []),
             "current_player": session.get("current_player"),
-            "pot": session.get("pot", 0)
+            "pot": session.get("pot", 0),
+            "winner": session.get("winner_id")
         }
 
         filename = os.path.join(self.data_dir, f"session_{game_id}_log.jsonl")
@@ -78,17 +160,54 @@ class SessionManager:
             print(f"Błąd zapisu logu: {e}")
             raise
 
+    def iter_hand_history(self, game_id=None):
+        game_ids = [game_id] if game_id is not None else self.list_game_ids()
+        for log_game_id in game_ids:
+            filename = f"session_{log_game_id}_log.jsonl"
+            for line in self._read_lines(log_game_id, "_log.jsonl", archived_first=True):
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"Pominięto uszkodzony wpis w {filename}")
+
     def load_session(self, game_id: str) -> dict:
         filename = os.path.join(self.data_dir, f"session_{game_id}.json")
         try:
-            with open(filename, 'r', encoding='utf-8') as file:
-                data = json.load(file)
+            if os.path.exists(filename):
+                with open(filename, 'r', encoding='utf-8') as file:
+                    data = json.load(file)
+                deltas = self._read_lines(game_id, "_delta.jsonl")
+            else:
+                content = self.archive.read(game_id, ".json")
+                if content is None:
+                    raise FileNotFoundError(filename)
+                data = json.loads(content)
+                deltas = (self.archive.read(game_id, "_delta.jsonl") or "").splitlines()
+
             players = [Player.from_dict(pdata) for pdata in data.get("players", [])]
             deck = Deck.from_dict(data.get("deck", {}))
+            opponent_stats = OpponentModel.from_dict(data.get("opponent_stats", {}))
+            snapshot_rounds = rounds = data.get("rounds", 0)
+            for line in deltas:
+                if not line.strip():
+                    continue
+                try:
+                    delta = json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"Pominięto uszkodzone zmiany sesji {game_id} od rundy {rounds + 1}")
+                    break
+                if delta.get("round", rounds + 1) <= snapshot_rounds:
+                    continue
+                for idx, stack in delta.get("stacks", {}).items():
+                    players[int(idx)].set_stack_amount(stack)
+                opponent_stats.apply_changes(delta.get("opponent_stats", {}))
+                rounds = delta.get("round", rounds + 1)
             return {
                 "game_id": data.get("game_id"),
                 "players": players,
                 "deck": deck,
+                "opponent_stats": opponent_stats,
+                "rounds": rounds,
             }
         except FileNotFoundError:
             print(f"Sesji nie ma: {filename}")
@@ -97,30 +216,24 @@ class SessionManager:
             print(f"Json jest niepoprawny: {filename}")
             raise
 
-    def save_config(self, config: dict) -> None:
-        config_path = os.path.join(self.data_dir, "config.json")
-        try:
-            with open(config_path, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2)
-        except IOError as e:
-            print(f"Błąd zapisu konfiguracji: {e}")
-            raise
+    def _read_lines(self, game_id, suffix: str, archived_first: bool = False):
+        if archived_first:
+            for line in (self.archive.read(game_id, suffix) or "").splitlines():
+                if line.strip():
+                    yield line
 
-    def load_config(self) -> dict:
-        config_path = os.path.join(self.data_dir, "config.json")
-        default_config = {
-            "starting_stack": 100,
-            "small_blind": 25,
-            "big_blind": 50,
-            "difficulty": "normal"
-        }
+        filename = os.path.join(self.data_dir, f"session_{game_id}{suffix}")
+        if not os.path.exists(filename):
+            return
+        with open(filename, 'r', encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    yield line
 
-        if not os.path.exists(config_path):
-            return default_config
+    def save_config(self, config: dict) -> None:
+        get_config_service(os.path.join(self.data_dir, "config.json")).save(config)
 
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (IOError, json.JSONDecodeError) as e:
-            print(f"Błąd odczytu konfiguracji, używam domyślnej: {e}")
-            return default_config
+    def load_config(self) -> dict:
+        config = get_config_service(os.path.join(self.data_dir, "config.json")).get()
+        config.setdefault("difficulty", "normal")
+        return config
@@ -7,6 +7,7 @@ from src.player import Player
 from src.exceptions import InvalidActionError, InsufficientFundsError, GameError
 from src.utils import evaluate_hand, ranks_to_int, hand_rank_names
 from src.fileops.session_manager import SessionManager
+from src.opponent_model import OpponentModel
 
 
 class GameEngine:
@@ -19,8 +20,16 @@ class GameEngine:
         self.current_bet = 0
         self.current_stage = "pre-flop"
         self.bets = []
+        self.draw_counts = {}
+        self.blinds = {}
         self.current_player = None
-        self.session_manager = SessionManager()
+        self.game_id = None
+        self.session_manager = self._create_session_manager()
+        self.opponent_model = OpponentModel()
+        self.bot_policy = None
+
+    def _create_session_manager(self):
+        return SessionManager()
 
     def play_round(self) -> None:
         self._reset_round()
@@ -43,18 +52,24 @@ class GameEngine:
         self.pot = 0
         print(f"Zwycięzca: {winner.get_name()}, otrzymuje {pot_amount} żetonów")
 
+        self._save_round(winner, pot_amount)
+        self.bets.clear()
+
+    def _save_round(self, winner: Player, pot_amount: int) -> None:
         session = {
-            "game_id": None,
+            "game_id": self.game_id,
             "players": self.players,
             "deck": self.deck,
             "stage": self.current_stage,
             "bets": self.bets,
             "pot": pot_amount,
+            "winner_id": self.players.index(winner) + 1,
             "current_player": None,
+            "opponent_stats": self.opponent_model,
             "completed_round": True
         }
         self.session_manager.save_session(session)
-        self.bets.clear()
+        self.game_id = session["game_id"]
 
     def _reset_round(self):
         for player in self.players:
@@ -66,16 +81,64 @@ class GameEngine:
         self.pot = 0
         self.current_bet = 0
         self.bets = []
+        self.draw_counts = {}
+        self.blinds = {}
         self.current_stage = "pre-flop"
+        self.opponent_model.start_hand(self.players)
+
+    def snapshot(self):
+        current = self.players.index(self.current_player) if self.current_player in self.players else None
+        return (tuple(player.snapshot() for player in self.players), tuple(self.deck.cards), self.pot,
+                self.current_bet, self.current_stage, tuple(self.bets), tuple(self.draw_counts.items()),
+                tuple(self.blinds.items()), current, self.opponent_model.snapshot())
+
+    def restore(self, state) -> None:
+        (players, cards, self.pot, self.current_bet, self.current_stage, bets, draw_counts, blinds, current,
+         opponent_model) = state
+        for player, player_state in zip(self.players, players):
+            player.restore(player_state)
+        self.deck.cards = list(cards)
+        self.bets = list(bets)
+        self.draw_counts = dict(draw_counts)
+        self.blinds = dict(blinds)
+        self.current_player = self.players[current] if current is not None else None
+        self.opponent_model.restore(opponent_model)
+
+    def _record_bet(self, player: Player, action: str, amount: int) -> None:
+        self.bets.append({
+            "stage": self.current_stage,
+            "player_id": self.players.index(player) + 1,
+            "action": action,
+            "amount": amount,
+            "pot": self.pot
+        })
+        self.opponent_model.record_action(player.get_name(), action)
+
+    def _record_draw(self, player: Player, count: int) -> None:
+        self.draw_counts[player.get_name()] = count
+        self.opponent_model.record_draw(player.get_name(), count)
+
+    def _opponent_aggression(self, player: Player) -> float:
+        rates = []
+        for p in self.players:
+            if p is player or p.folded:
+                continue
+            stats = self.opponent_model.get(p.get_name())
+            if stats.actions >= 10:
+                rates.append(stats.raise_rate())
+        return max(rates, default=0.0)
 
     def _post_blinds(self):
         blinds = []
-        for player in self.players:
+        for index, player in enumerate(self.players):
+            if player.folded:
+                continue
             blind = random.choice([self.small_blind, self.big_blind])
-            money = player.pay(blind)
+            money = player.pay(min(blind, player.get_stack_amount()))
             self.pot += money
-            player.current_bet = blind
-            blinds.append(blind)
+            player.current_bet = money
+            blinds.append(money)
+            self.blinds[index] = money
         self.current_bet = max(blinds) if blinds else 0
 
     def betting_round(self):
@@ -108,13 +171,7 @@ class GameEngine:
                     player.last_action = action
                     print(f"{player.get_name()} wybrał akcję {action}")
 
-                    self.bets.append({
-                        "stage": self.current_stage,
-                        "player_id": self.players.index(player) + 1,
-                        "action": action,
-                        "amount": current_bet if action in ['call', 'raise'] else 0,
-                        "pot": self.pot
-                    })
+                    self._record_bet(player, action, current_bet if action in ['call', 'raise'] else 0)
 
                     if action == 'fold':
                         player.folded = True
@@ -202,6 +259,9 @@ class GameEngine:
             return self._bot_decide_action(player, current_bet)
 
     def _bot_decide_action(self, player: Player, current_bet: int) -> str:
+        if self.bot_policy is not None:
+            return self.bot_policy.decide(self, player, current_bet)
+
         if current_bet == 0:
             return "check" if random.random() < 0.7 else "raise"
 
@@ -209,6 +269,8 @@ class GameEngine:
         if player.get_stack_amount() >= current_bet:
             choices.extend(["call"] * 5)
             choices.extend(["fold"] * 3)
+            if self._opponent_aggression(player) > 0.4:
+                choices.extend(["call"] * 2)
         if player.get_stack_amount() >= current_bet + self.big_blind:
             choices.extend(["raise"] * 2)
 
@@ -229,6 +291,7 @@ class GameEngine:
 
                 exchanged_cards = self.exchange_cards(player.get_hand(), indices)
                 player.set_hand(exchanged_cards)
+                self._record_draw(player, len(indices))
 
             except (ValueError, IndexError) as e:
                 print(f"Niedozwolona wymiana: {e}. Nie wymieniono żadnych kart.")
@@ -268,4 +331,9 @@ class GameEngine:
 
         rankings.sort(reverse=True, key=lambda x: (x[0], x[1]))
 
-        return rankings[0][2]
+        winner = rankings[0][2]
+        if len(rankings) > 1:
+            for rank_value, _, player in rankings:
+                self.opponent_model.record_showdown(player.get_name(), rank_value, player is winner)
+
+        return winner
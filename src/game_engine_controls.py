@@ -21,6 +21,7 @@ class GuiGameEngine(GameEngine):
 
             self.gui.update_all_displays()
             self.gui.add_message(f"Blinds posted: Small ${self.small_blind}, Big ${self.big_blind}")
+            self._fast_forward_if_human_done()
 
             self.deck.shuffle()
             self.deck.deal(self.players, 5)
@@ -31,25 +32,31 @@ class GuiGameEngine(GameEngine):
                 self.gui.add_message("Cards dealt. Starting betting round...")
 
             self.current_stage = "betting"
+            self.gui.mark_dirty("stage")
             self.betting_round()
 
             active_players = [p for p in self.players if not p.folded]
             if len(active_players) > 1:
                 self.current_stage = "exchange"
+                self.gui.mark_dirty("stage")
                 self.gui.add_message("--- Card Exchange Phase ---")
                 self._handle_card_exchange(active_players)
 
             active_players = [p for p in self.players if not p.folded]
             if len(active_players) > 1:
                 self.current_stage = "showdown"
+                self.gui.mark_dirty("stage")
                 self._handle_showdown()
             else:
                 winner = active_players[0] if active_players else self.players[0]
                 self._award_pot_to_winner(winner)
 
         except Exception as e:
+            self.gui.end_fast_forward()
             self.gui.add_message(f"Game error: {str(e)}")
             self.gui.show_game_over()
+        else:
+            self.gui.end_fast_forward()
 
     def betting_round(self):
         active = [p for p in self.players if not p.folded]
@@ -60,6 +67,7 @@ class GuiGameEngine(GameEngine):
             p.last_action = None
             p.current_bet = 0
 
+        self.blinds = {}
         self.current_bet = self.big_blind
 
         max_rounds = 10
@@ -83,12 +91,11 @@ class GuiGameEngine(GameEngine):
 
                 to_call = max(0, self.current_bet - player.current_bet)
 
-                self.gui.update_all_displays()
-
                 try:
                     if player.get_stack_amount() <= 0:
                         continue
 
+                    bet_before = player.current_bet
                     action = self.prompt_bet(player, to_call)
                     players_acted += 1
 
@@ -140,7 +147,9 @@ class GuiGameEngine(GameEngine):
                             player.last_action = 'fold'
                             self.gui.add_message(f"{player.get_name()} cannot raise - folds")
 
-                    self.gui.update_all_displays()
+                    self._record_bet(player, player.last_action, player.current_bet - bet_before)
+                    self.gui.mark_dirty("pot", "current_bet", player)
+                    self._fast_forward_if_human_done()
 
                     remaining = [p for p in self.players if not p.folded]
                     if len(remaining) <= 1:
@@ -164,6 +173,18 @@ class GuiGameEngine(GameEngine):
 
         self.gui.add_message("Betting round complete")
 
+    def _human_can_act(self):
+        human = next((p for p in self.players if p.is_human()), None)
+        if human is None or human.folded:
+            return False
+        if human.get_stack_amount() > 0:
+            return True
+        return self.current_stage in ("pre-flop", "betting")
+
+    def _fast_forward_if_human_done(self):
+        if any(p.is_human() for p in self.players) and not self._human_can_act():
+            self.gui.begin_fast_forward()
+
     def prompt_bet(self, player, current_bet):
         if player.is_human():
             if player.get_stack_amount() <= 0:
@@ -175,7 +196,7 @@ class GuiGameEngine(GameEngine):
             self.gui.request_player_action(player, current_bet)
 
             while self.waiting_for_action and self.player_action is None:
-                self.gui.process_events()
+                self.gui.wait_for_input()
 
             action = self.player_action
             self.waiting_for_action = False
@@ -193,7 +214,7 @@ class GuiGameEngine(GameEngine):
             self.gui.request_raise_amount(current_bet)
 
             while self.waiting_for_raise and self.raise_amount == 0:
-                self.gui.process_events()
+                self.gui.wait_for_input()
 
             amount = self.raise_amount
             self.waiting_for_raise = False
@@ -216,9 +237,10 @@ class GuiGameEngine(GameEngine):
                 self.gui.request_card_exchange(player)
 
                 while self.waiting_for_exchange and self.exchange_indices is None:
-                    self.gui.process_events()
+                    self.gui.wait_for_input()
 
                 if self.exchange_indices is not None:
+                    self._record_draw(player, len(self.exchange_indices))
                     if len(self.exchange_indices) > 0:
                         new_hand = self.exchange_cards(player.get_hand(), self.exchange_indices)
                         player.set_hand(new_hand)
@@ -230,6 +252,7 @@ class GuiGameEngine(GameEngine):
 
                 self.waiting_for_exchange = False
                 self.exchange_indices = None
+                self._fast_forward_if_human_done()
 
             else:
                 hand = player.get_hand()
@@ -252,6 +275,7 @@ class GuiGameEngine(GameEngine):
                 if len(exchange_indices) > 3:
                     exchange_indices = exchange_indices[:3]
 
+                self._record_draw(player, len(exchange_indices))
                 if exchange_indices:
                     new_hand = self.exchange_cards(player.get_hand(), exchange_indices)
                     player.set_hand(new_hand)
@@ -287,6 +311,8 @@ class GuiGameEngine(GameEngine):
 
         rankings.sort(reverse=True, key=lambda x: (x[0], x[1]))
         winner = rankings[0][2]
+        for rank_value, _, player in rankings:
+            self.opponent_model.record_showdown(player.get_name(), rank_value, player is winner)
 
         pot_amount = self.pot
         self._award_pot_to_winner(winner)
@@ -297,6 +323,7 @@ class GuiGameEngine(GameEngine):
     def _award_pot_to_winner(self, winner):
         pot_amount = self.pot
         winner.set_stack_amount(winner.get_stack_amount() + pot_amount)
+        self._save_round(winner, pot_amount)
         self.gui.enable_new_round()
 
         for player in self.players:
@@ -311,16 +338,21 @@ class GuiGameEngine(GameEngine):
     def set_player_action(self, action):
         self.player_action = action
         self.waiting_for_action = False
+        self.gui.release_input()
 
     def set_raise_amount(self, amount):
         self.raise_amount = amount
         self.waiting_for_raise = False
+        self.gui.release_input()
 
     def set_exchange_indices(self, indices):
         self.exchange_indices = indices if indices is not None else []
         self.waiting_for_exchange = False
+        self.gui.release_input()
 
     def _bot_decide_action(self, player, current_bet):
+        if self.bot_policy is not None:
+            return self.bot_policy.decide(self, player, current_bet)
 
         available_chips = player.get_stack_amount()
 
@@ -341,6 +373,7 @@ class GuiGameEngine(GameEngine):
 
             has_pair = any(count >= 2 for count in rank_counts.values())
             high_cards = sum(1 for rank in numeric_ranks if rank >= 10)
+            loosen = 0.2 if self._opponent_aggression(player) > 0.4 else 0.0
 
             if current_bet == 0:
                 if has_pair or high_cards >= 3:
@@ -362,12 +395,12 @@ class GuiGameEngine(GameEngine):
                     else:
                         return 'call'
                 elif high_cards >= 2:
-                    if random.random() < 0.5:
+                    if random.random() < 0.5 + loosen:
                         return 'call'
                     else:
                         return 'fold'
                 else:
-                    if random.random() < 0.2:
+                    if random.random() < 0.2 + loosen:
                         return 'call'
                     else:
                         return 'fold'
@@ -384,7 +417,7 @@ class GuiGameEngine(GameEngine):
 
         for player in self.players:
             player.current_bet = 0
-            player.folded = False
+            player.folded = player.get_stack_amount() <= 0
             player.last_action = None
 
         self.pot = 0
@@ -2,35 +2,35 @@ import sys
 import os
 import math
 import time
-import json
+import threading
+from collections import OrderedDict, deque
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QPushButton, QLabel,
-    QVBoxLayout, QWidget, QHBoxLayout, QTextEdit,
+    QVBoxLayout, QWidget, QHBoxLayout, QPlainTextEdit,
     QInputDialog, QFrame, QSizePolicy, QGridLayout,
     QMessageBox, QProgressBar, QGraphicsView, QGraphicsScene, QGraphicsObject,
-    QMenu, QDialog, QFormLayout, QSpinBox, QDialogButtonBox, QComboBox
+    QMenu, QDialog, QFormLayout, QSpinBox, QDialogButtonBox, QComboBox, QCheckBox
 )
-from PyQt5.QtCore import Qt, QRectF, QPointF, QPropertyAnimation, QTimer
-from PyQt5.QtGui import QPixmap, QPainter, QBrush, QColor, QFont
+from PyQt5.QtCore import (
+    Qt, QRectF, QPointF, QPropertyAnimation, QTimer, QRunnable, QThreadPool, QEventLoop, QObject, pyqtSignal
+)
+from PyQt5.QtGui import QPixmap, QImage, QPainter, QBrush, QColor, QFont
 
+from src.card_atlas import CARDS_DIR, load_atlas, atlas_card
+from src.config import get_config_service, save_config
 from src.deck import Deck
+from src.equity import EquitySampler
+from src.bot_policy import POLICIES, create_policy
+from src.decision_cache import DecisionCache
 from src.player import Player
 from src.game_engine_controls import GuiGameEngine
 
 
-def load_config():
-    config_path = os.path.join(os.path.dirname(__file__), "../config.json")
-    with open(config_path, "r") as f:
-        return json.load(f)
-
-
-def save_config(config):
-    config_path = os.path.join(os.path.dirname(__file__), "../config.json")
-    with open(config_path, "w") as f:
-        json.dump(config, f, indent=4)
+CARD_WIDTH = 100
+CARD_HEIGHT = 150
 
 
-def load_card_pixmap(card):
+def card_code(card):
     suit_map = {'s': 'S', 'h': 'H', 'd': 'D', 'c': 'C'}
     rank_map = {'10': '10', 'J': 'J', 'Q': 'Q', 'K': 'K', 'A': 'A'}
 
@@ -42,57 +42,183 @@ def load_card_pixmap(card):
     elif rank == '1':
         rank = 'A'
 
-    filename_png = f"{rank}{suit}.png"
-    filename_jpg = f"{rank}{suit}.jpg"
+    return f"{rank}{suit}"
 
-    config = load_config()
-    skin = config.get("skin", "Rust")
-    cards_dir = os.path.join(os.path.dirname(__file__), "cards", skin)
-
-    path_png = os.path.join(cards_dir, filename_png)
-    path_jpg = os.path.join(cards_dir, filename_jpg)
 
+def card_image_path(skin, code):
+    cards_dir = os.path.join(CARDS_DIR, skin)
+    path_png = os.path.join(cards_dir, f"{code}.png")
     if os.path.exists(path_png):
-        path = path_png
+        return path_png
+    return os.path.join(cards_dir, f"{code}.jpg")
+
+
+def load_card_image(skin, code, width=CARD_WIDTH, height=CARD_HEIGHT):
+    image = QImage(card_image_path(skin, code))
+    if image.isNull():
+        return image
+    return image.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+def placeholder_card_pixmap(card, width=CARD_WIDTH, height=CARD_HEIGHT):
+    pixmap = QPixmap(width, height)
+    pixmap.fill(QColor(255, 255, 255))
+    painter = QPainter(pixmap)
+    painter.setPen(Qt.black)
+    font = QFont("Arial", 16, QFont.Bold)
+    painter.setFont(font)
+
+    rank_text = str(card.rank)
+    if rank_text == '1':
+        rank_text = 'A'
+    elif rank_text == '11':
+        rank_text = 'J'
+    elif rank_text == '12':
+        rank_text = 'Q'
+    elif rank_text == '13':
+        rank_text = 'K'
+
+    suit_symbols = {'s': '♠', 'h': '♥', 'd': '♦', 'c': '♣'}
+    suit_symbol = suit_symbols.get(card.suit.lower(), card.suit)
+
+    if card.suit.lower() in ['h', 'd']:
+        painter.setPen(Qt.red)
     else:
-        path = path_jpg
-
-    pixmap = QPixmap(path)
-    if pixmap.isNull():
-        pixmap = QPixmap(100, 150)
-        pixmap.fill(QColor(255, 255, 255))
-        painter = QPainter(pixmap)
         painter.setPen(Qt.black)
-        font = QFont("Arial", 16, QFont.Bold)
-        painter.setFont(font)
-
-        rank_text = str(card.rank)
-        if rank_text == '1':
-            rank_text = 'A'
-        elif rank_text == '11':
-            rank_text = 'J'
-        elif rank_text == '12':
-            rank_text = 'Q'
-        elif rank_text == '13':
-            rank_text = 'K'
-
-        suit_symbols = {'s': '♠', 'h': '♥', 'd': '♦', 'c': '♣'}
-        suit_symbol = suit_symbols.get(card.suit.lower(), card.suit)
-
-        if card.suit.lower() in ['h', 'd']:
-            painter.setPen(Qt.red)
+
+    text = f"{rank_text}\n{suit_symbol}"
+    painter.drawText(pixmap.rect(), Qt.AlignCenter, text)
+    painter.end()
+    return pixmap
+
+
+class SkinPreloader(QRunnable):
+    def __init__(self, cache, skin, width, height, scale, done):
+        super().__init__()
+        self.cache = cache
+        self.skin = skin
+        self.width = width
+        self.height = height
+        self.scale = scale
+        self.done = done
+
+    def run(self):
+        key = (self.skin, self.width, self.height, self.scale)
+        try:
+            atlas, index = load_atlas(self.skin, self.width, self.height, self.scale)
+            if atlas is not None:
+                self.cache.put_atlas(key, atlas, index)
+        finally:
+            self.cache.finish_preload(key, self.done)
+
+
+class EquitySignals(QObject):
+    progress = pyqtSignal(int, object)
+
+
+class EquityWorker(QRunnable):
+    def __init__(self, generation, sampler, signals, batch=200, max_trials=20000, pause=0.002):
+        super().__init__()
+        self.generation = generation
+        self.sampler = sampler
+        self.signals = signals
+        self.batch = batch
+        self.max_trials = max_trials
+        self.pause = pause
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def run(self):
+        while not self.cancelled.is_set() and self.sampler.trials() < self.max_trials:
+            self.sampler.run(self.batch)
+            if self.cancelled.is_set():
+                return
+            self.signals.progress.emit(self.generation, self.sampler.snapshot())
+            self.cancelled.wait(self.pause)
+
+
+class CardPixmapCache:
+    def __init__(self, max_size=160, preload_timeout=5.0):
+        self.max_size = max_size
+        self.preload_timeout = preload_timeout
+        self.active_skin = "Rust"
+        self.scale = 1.0
+        self._pixmaps = OrderedDict()
+        self._atlases = {}
+        self._preloading = {}
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def put_atlas(self, key, atlas, index):
+        with self._lock:
+            self._atlases[key] = (atlas, index)
+
+    def finish_preload(self, key, done):
+        with self._lock:
+            if self._preloading.get(key) is done:
+                del self._preloading[key]
+        done.set()
+
+    def get(self, card, skin=None, width=CARD_WIDTH, height=CARD_HEIGHT):
+        skin = skin or self.active_skin
+        code = card_code(card)
+        key = (skin, code, width, height, self.scale)
+
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+            return pixmap
+
+        atlas_key = (skin, width, height, self.scale)
+        with self._lock:
+            atlas, index = self._atlases.get(atlas_key, (None, None))
+            preloading = self._preloading.get(atlas_key)
+        if atlas is None and preloading is not None:
+            preloading.wait(self.preload_timeout)
+            if not preloading.is_set():
+                return placeholder_card_pixmap(card, width, height)
+            with self._lock:
+                atlas, index = self._atlases.get(atlas_key, (None, None))
+
+        if atlas is not None and code in index["cards"]:
+            image = atlas_card(atlas, index, code)
         else:
-            painter.setPen(Qt.black)
+            image = load_card_image(skin, code, width, height)
 
-        text = f"{rank_text}\n{suit_symbol}"
-        painter.drawText(pixmap.rect(), Qt.AlignCenter, text)
-        painter.end()
-    else:
-        pixmap = pixmap.scaled(100, 150, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        if image.isNull():
+            pixmap = placeholder_card_pixmap(card, width, height)
+        else:
+            pixmap = QPixmap.fromImage(image)
 
-    return pixmap
+        with self._lock:
+            self._pixmaps[key] = pixmap
+            while len(self._pixmaps) > self.max_size:
+                self._pixmaps.popitem(last=False)
+        return pixmap
+
+    def preload(self, skin, width=CARD_WIDTH, height=CARD_HEIGHT, scale=None):
+        self.active_skin = skin
+        if scale is not None:
+            self.scale = scale
+        key = (skin, width, height, self.scale)
+        done = threading.Event()
+        with self._lock:
+            self._atlases = {atlas_key: value for atlas_key, value in self._atlases.items() if atlas_key[0] == skin}
+            self._preloading[key] = done
+        if self._pool is None:
+            self._pool = QThreadPool()
+            self._pool.setMaxThreadCount(1)
+        self._pool.start(SkinPreloader(self, skin, width, height, self.scale, done))
+
+
+card_cache = CardPixmapCache()
 
 
+def load_card_pixmap(card, skin=None):
+    return card_cache.get(card, skin)
+
 
 class CardItem(QGraphicsObject):
     SHIFT_DISTANCE = 30
@@ -101,7 +227,9 @@ class CardItem(QGraphicsObject):
     def __init__(self, pixmap, orig_pos, z, index, parent):
         super().__init__()
         self.pixmap = pixmap
-        self.setTransformOriginPoint(pixmap.width() / 2, pixmap.height() / 2)
+        self.card_width = pixmap.width() / pixmap.devicePixelRatio()
+        self.card_height = pixmap.height() / pixmap.devicePixelRatio()
+        self.setTransformOriginPoint(self.card_width / 2, self.card_height / 2)
         self.original_pos = orig_pos
         self.shifted = False
         self.setZValue(z)
@@ -111,8 +239,26 @@ class CardItem(QGraphicsObject):
         self.anim.setDuration(self.ANIM_DURATION)
         self.setPos(orig_pos)
 
+    def set_card(self, pixmap, orig_pos, z, index):
+        self.anim.stop()
+        if pixmap is not self.pixmap:
+            width = pixmap.width() / pixmap.devicePixelRatio()
+            height = pixmap.height() / pixmap.devicePixelRatio()
+            if (width, height) != (self.card_width, self.card_height):
+                self.prepareGeometryChange()
+                self.card_width = width
+                self.card_height = height
+                self.setTransformOriginPoint(width / 2, height / 2)
+            self.pixmap = pixmap
+            self.update()
+        self.original_pos = orig_pos
+        self.shifted = False
+        self.setZValue(z)
+        self.index = index
+        self.setPos(orig_pos)
+
     def boundingRect(self):
-        return QRectF(0, 0, self.pixmap.width(), self.pixmap.height())
+        return QRectF(0, 0, self.card_width, self.card_height)
 
     def paint(self, painter, option, widget):
         painter.drawPixmap(0, 0, self.pixmap)
@@ -157,19 +303,61 @@ class CardItem(QGraphicsObject):
 
 
 class PokerGUI(QMainWindow):
-    def __init__(self):
+    REFRESH_INTERVAL_MS = 16
+    MESSAGE_FLUSH_MS = 50
+    MESSAGE_LOG_MAX_BYTES = 1024 * 1024
+    CONFIG_CHECK_MS = 2000
+
+    def __init__(self, session=None):
         super().__init__()
         self.setWindowTitle("Five Card Draw Poker")
         self.setGeometry(100, 100, 1200, 800)
 
-        self.config = load_config()
+        self.config_service = get_config_service()
+        self.config = self.config_service.get()
+        self.session = session
+        card_cache.preload(self.config["skin"], scale=self.devicePixelRatioF())
+        self.config_service.subscribe(self.on_config_changed)
+        self.decision_cache = DecisionCache(self.config["bot_cache_size"], self.config["bot_cache_file"] or None)
+        self.decision_cache.load()
         self.setup_game_from_config()
 
         self.selected_cards = []
         self.card_items = []
+        self.card_pool = []
         self.last_click_time = 0
         self.exchange_phase = False
         self.game_over = False
+        self.input_loop = None
+        self.input_released = False
+        self.fast_forward = False
+        self.hand_drawn = False
+        self.discarded_cards = []
+
+        self.equity_signals = EquitySignals(self)
+        self.equity_signals.progress.connect(self.on_equity_progress)
+        self.equity_pool = QThreadPool(self)
+        self.equity_pool.setMaxThreadCount(1)
+        self.equity_worker = None
+        self.equity_generation = 0
+        self.equity_key = None
+
+        self.dirty = set()
+        self.label_state = {}
+        self.highlighted_player = None
+        self.refresh_requests = 0
+        self.refresh_paints = 0
+        self.unchanged_labels = 0
+        self.debug = self.config.get("debug", False)
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(self.REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self.flush_displays)
+
+        self.config_timer = QTimer(self)
+        self.config_timer.setInterval(self.CONFIG_CHECK_MS)
+        self.config_timer.timeout.connect(self.check_config)
+        self.config_timer.start()
 
         self.setup_ui()
         self.update_all_displays()
@@ -178,15 +366,24 @@ class PokerGUI(QMainWindow):
 
     def setup_game_from_config(self):
         self.deck = Deck()
-        self.players = [Player(self.config["starting_chips"], "You", True)]
-        for i in range(self.config["num_bots"]):
-            self.players.append(Player(self.config["starting_chips"], f"Bot {i+1}", False))
+        if self.session and any(p.is_human() for p in self.session["players"]):
+            self.players = self.session["players"]
+        else:
+            self.session = None
+            self.players = [Player(self.config["starting_chips"], "You", True)]
+            for i in range(self.config["num_bots"]):
+                self.players.append(Player(self.config["starting_chips"], f"Bot {i+1}", False))
 
         self.engine = GuiGameEngine(
             self.players, self.deck,
             self.config["small_blind"], self.config["big_blind"],
             gui_handler=self
         )
+        self.engine.bot_policy = self.create_bot_policy(self.config)
+        if self.session:
+            self.engine.game_id = self.session.get("game_id")
+            if self.session.get("opponent_stats") is not None:
+                self.engine.opponent_model = self.session["opponent_stats"]
 
     def setup_ui(self):
         menu_bar = self.menuBar()
@@ -261,8 +458,14 @@ class PokerGUI(QMainWindow):
         self.human_player_label.setStyleSheet("QLabel { color: blue; }")
         self.human_player_label.setAlignment(Qt.AlignCenter)
 
+        self.equity_label = QLabel("")
+        self.equity_label.setFont(QFont("Arial", 10))
+        self.equity_label.setAlignment(Qt.AlignCenter)
+        self.equity_label.setVisible(self.config["equity_hud"])
+
         player_layout.addWidget(title_label)
         player_layout.addWidget(self.human_player_label)
+        player_layout.addWidget(self.equity_label)
         player_layout.addStretch()
 
         parent_layout.addWidget(player_frame)
@@ -326,6 +529,9 @@ class PokerGUI(QMainWindow):
         self.btn_keep_all = QPushButton("Keep All Cards")
 
         self.btn_new_round = QPushButton("Start New Round")
+        self.btn_skip = QPushButton("Skip to My Next Hand")
+        self.btn_skip.setCheckable(True)
+        self.btn_skip.setToolTip("After you fold, finish the hand without animation and deal the next one")
 
         button_style = """
             QPushButton {
@@ -342,6 +548,9 @@ class PokerGUI(QMainWindow):
             QPushButton:pressed {
                 background-color: #d0d0d0;
             }
+            QPushButton:checked {
+                background-color: #c8dcf0;
+            }
             QPushButton:disabled {
                 background-color: #cccccc;
                 color: #666666;
@@ -349,7 +558,7 @@ class PokerGUI(QMainWindow):
         """
 
         for btn in [self.btn_fold, self.btn_check_call, self.btn_raise,
-                    self.btn_exchange, self.btn_keep_all, self.btn_new_round]:
+                    self.btn_exchange, self.btn_keep_all, self.btn_new_round, self.btn_skip]:
             btn.setStyleSheet(button_style)
             btn.setMinimumWidth(120)
 
@@ -359,6 +568,7 @@ class PokerGUI(QMainWindow):
         self.btn_exchange.clicked.connect(self.handle_exchange)
         self.btn_keep_all.clicked.connect(lambda: self.handle_exchange(keep_all=True))
         self.btn_new_round.clicked.connect(self.start_new_round)
+        self.btn_skip.toggled.connect(lambda checked: checked and self.skip_to_next_hand())
 
         controls_layout.addWidget(self.btn_fold)
         controls_layout.addWidget(self.btn_check_call)
@@ -368,6 +578,7 @@ class PokerGUI(QMainWindow):
         controls_layout.addWidget(self.btn_keep_all)
         controls_layout.addStretch()
         controls_layout.addWidget(self.btn_new_round)
+        controls_layout.addWidget(self.btn_skip)
 
         parent_layout.addWidget(controls_frame)
 
@@ -376,11 +587,21 @@ class PokerGUI(QMainWindow):
         self.btn_new_round.setEnabled(False)
 
     def create_messages_area(self, parent_layout):
-        self.messages = QTextEdit()
+        self.max_message_lines = self.config["log_max_lines"]
+        self.spill_messages = self.config["log_spill"]
+        self.message_lines = deque()
+        self.pending_messages = []
+        self.message_timer = QTimer(self)
+        self.message_timer.setSingleShot(True)
+        self.message_timer.setInterval(self.MESSAGE_FLUSH_MS)
+        self.message_timer.timeout.connect(self.flush_messages)
+
+        self.messages = QPlainTextEdit()
         self.messages.setReadOnly(True)
+        self.messages.setMaximumBlockCount(self.max_message_lines)
         self.messages.setMaximumHeight(150)
         self.messages.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: #f8f8f8;
                 border: 1px solid #ccc;
                 font-family: monospace;
@@ -419,69 +640,238 @@ class PokerGUI(QMainWindow):
         center_y = scene_rect.height()
 
         for i, card in enumerate(cards):
-            pixmap = load_card_pixmap(card)
+            pixmap = load_card_pixmap(card, self.config.get("skin", "Rust"))
 
             if i < len(params):
                 p = params[i]
             else:
                 p = {'angle': 0, 'x': 0, 'y': 0}
 
-            x = center_x + p['x'] - pixmap.width() / 2
-            y = center_y + p['y'] - pixmap.height() / 2
+            x = center_x + p['x'] - pixmap.width() / pixmap.devicePixelRatio() / 2
+            y = center_y + p['y'] - pixmap.height() / pixmap.devicePixelRatio() / 2
 
-            card_item = CardItem(pixmap, QPointF(x, y), z=i, index=i, parent=self)
-            card_item.setRotation(p['angle'])
+            if i < len(self.card_pool):
+                card_item = self.card_pool[i]
+                card_item.set_card(pixmap, QPointF(x, y), z=i, index=i)
+            else:
+                card_item = CardItem(pixmap, QPointF(x, y), z=i, index=i, parent=self)
+                self.scene.addItem(card_item)
+                self.card_pool.append(card_item)
 
-            self.scene.addItem(card_item)
+            card_item.setRotation(p['angle'])
+            card_item.setVisible(True)
             self.card_items.append(card_item)
 
     def clear_card_scene(self):
-        for item in self.card_items:
-            if hasattr(item, 'anim'):
-                item.anim.stop()
-        self.scene.clear()
+        for item in self.card_pool:
+            item.anim.stop()
+            item.setVisible(False)
         self.card_items = []
 
     def update_all_displays(self):
-        self.pot_label.setText(f"Pot: ${self.engine.pot}")
-        self.stage_label.setText(f"Stage: {self.engine.current_stage.title()}")
-        self.current_bet_label.setText(f"Current Bet: ${self.engine.current_bet}")
+        self.mark_dirty("pot", "stage", "current_bet", *self.players)
 
-        human_player = next(p for p in self.players if p.is_human())
-        status = f"{human_player.get_name()}: ${human_player.get_stack_amount()}"
-        if human_player.folded:
-            status += " (Folded)"
-        if human_player == self.engine.current_player:
-            self.human_player_label.setStyleSheet("QLabel { color: red; font-weight: bold; }")
-        else:
-            self.human_player_label.setStyleSheet("QLabel { color: blue; font-weight: bold; }")
+    def mark_dirty(self, *parts):
+        self.dirty.update(parts)
+        self.refresh_requests += 1
+        if not self.fast_forward and not self.refresh_timer.isActive():
+            self.refresh_timer.start()
 
-        self.human_player_label.setText(status)
+    def flush_displays(self):
+        if self.engine.current_player is not self.highlighted_player:
+            self.dirty.update(p for p in (self.highlighted_player, self.engine.current_player) if p is not None)
+            self.highlighted_player = self.engine.current_player
+
+        dirty, self.dirty = self.dirty, set()
+        self.refresh_paints += 1
+
+        if "pot" in dirty:
+            self.set_label(self.pot_label, f"Pot: ${self.engine.pot}")
+        if "stage" in dirty:
+            self.set_label(self.stage_label, f"Stage: {self.engine.current_stage.title()}")
+        if "current_bet" in dirty:
+            self.set_label(self.current_bet_label, f"Current Bet: ${self.engine.current_bet}")
 
         bot_index = 0
         for player in self.players:
-            if not player.is_human() and bot_index < len(self.bot_labels):
+            if player.is_human():
+                label = self.human_player_label
+                color = "red" if player is self.engine.current_player else "blue"
+                style = f"QLabel {{ color: {color}; font-weight: bold; }}"
+            elif bot_index < len(self.bot_labels):
                 label = self.bot_labels[bot_index]
-                status = f"{player.get_name()}: ${player.get_stack_amount()}"
-                if player.folded:
-                    status += " (Folded)"
-                if player == self.engine.current_player:
-                    label.setStyleSheet("QLabel { color: black; font-weight: bold; margin: 5px; }")
-
-                label.setText(status)
                 bot_index += 1
+                if player is self.engine.current_player:
+                    style = "QLabel { color: black; font-weight: bold; margin: 5px; }"
+                else:
+                    style = "QLabel { margin: 5px; }"
+            else:
+                continue
+
+            if player not in dirty:
+                continue
+
+            status = f"{player.get_name()}: ${player.get_stack_amount()}"
+            if player.folded:
+                status += " (Folded)"
+            self.set_label(label, status, style)
+            if not player.is_human():
+                label.setToolTip(self.engine.opponent_model.get(player.get_name()).summary())
+
+        self.update_equity_hud()
+
+        if self.debug:
+            self.statusBar().showMessage(
+                f"Refresh: {self.refresh_requests} requests, {self.refresh_paints} paints, "
+                f"{self.refresh_requests - self.refresh_paints} coalesced, {self.unchanged_labels} unchanged labels skipped"
+                f" | Bot cache: {self.decision_cache.summary()}"
+            )
+
+    def update_equity_hud(self):
+        human = next(p for p in self.players if p.is_human())
+        draw_counts = tuple(self.engine.draw_counts.get(p.get_name(), 0)
+                            for p in self.players if not p.is_human() and not p.folded)
+        opponents = len(draw_counts)
+        key = None
+        if (self.config["equity_hud"] and self.engine.current_stage in ("betting", "exchange")
+                and not human.folded and opponents > 0 and len(human.get_hand()) == 5):
+            key = (tuple(card_code(card) for card in human.get_hand()), draw_counts, self.hand_drawn)
+
+        if key == self.equity_key:
+            return
+        self.cancel_equity()
+        self.equity_key = key
+        if key is None:
+            self.equity_label.setText("")
+            return
+
+        self.equity_label.setText(f"Win: calculating vs {opponents}...")
+        sampler = EquitySampler(human.get_hand(), opponents, self.discarded_cards,
+                                can_draw=not self.hand_drawn, draw_counts=draw_counts)
+        self.equity_worker = EquityWorker(self.equity_generation, sampler, self.equity_signals)
+        self.equity_pool.start(self.equity_worker)
+
+    def cancel_equity(self):
+        self.equity_generation += 1
+        self.equity_pool.clear()
+        if self.equity_worker is not None:
+            self.equity_worker.cancel()
+            self.equity_worker = None
+
+    def on_equity_progress(self, generation, result):
+        if generation != self.equity_generation or self.equity_key is None:
+            return
+        wins, ties, losses = result["current"]
+        trials = wins + ties + losses
+        text = (f"Win: {wins / trials:.1%}  Tie: {ties / trials:.1%} vs {result['opponents']} "
+                f"({trials} samples)")
+        if result["can_draw"]:
+            wins, ties, losses = result["best"]
+            equity = (wins + ties / 2) / trials
+            discard = " ".join(str(card) for card in result["best_discard"]) or "keep all"
+            text += f"\nBest discard: {discard} -> {equity:.1%} (EV ${equity * self.engine.pot:.0f})"
+        self.equity_label.setText(text)
+
+    def set_label(self, label, text, style=None):
+        state = (text, style)
+        if self.label_state.get(label) == state:
+            self.unchanged_labels += 1
+            return
+        self.label_state[label] = state
+        label.setText(text)
+        if style is not None:
+            label.setStyleSheet(style)
 
     def update_exchange_button_text(self):
         count = len(self.selected_cards)
         self.btn_exchange.setText(f"Exchange Selected Cards ({count})")
 
     def add_message(self, message):
-        self.messages.append(message)
+        self.pending_messages.append(str(message))
+        if not self.fast_forward and not self.message_timer.isActive():
+            self.message_timer.start()
+
+    def begin_fast_forward(self):
+        if self.fast_forward or not self.config.get("fast_forward", True):
+            return
+        self.fast_forward = True
+        self.cancel_equity()
+        self.equity_key = None
+        self.refresh_timer.stop()
+        self.message_timer.stop()
+        self.centralWidget().setUpdatesEnabled(False)
+
+    def end_fast_forward(self):
+        if not self.fast_forward:
+            return
+        self.fast_forward = False
+        self.centralWidget().setUpdatesEnabled(True)
+        self.flush_messages()
+        self.flush_displays()
+
+        if self.btn_skip.isChecked() and not self.game_over:
+            QTimer.singleShot(0, self.skip_to_next_hand)
+
+    def skip_to_next_hand(self):
+        if self.btn_skip.isChecked() and self.btn_new_round.isEnabled() and not self.game_over:
+            self.start_new_round()
+
+    def flush_messages(self):
+        if not self.pending_messages:
+            return
+        lines = "\n".join(self.pending_messages).split("\n")
+        self.pending_messages = []
+
+        self.message_lines.extend(lines)
+        overflow = len(self.message_lines) - self.max_message_lines
+        if overflow > 0:
+            evicted = [self.message_lines.popleft() for _ in range(overflow)]
+            self.spill_message_lines(evicted)
+
+        self.messages.appendPlainText("\n".join(lines[-self.max_message_lines:]))
         scrollbar = self.messages.verticalScrollBar()
         scrollbar.setValue(scrollbar.maximum())
 
-    def process_events(self):
-        QApplication.processEvents()
+    def clear_messages(self):
+        self.flush_messages()
+        self.spill_message_lines(self.message_lines)
+        self.message_lines.clear()
+        self.messages.clear()
+
+    def spill_message_lines(self, lines):
+        if not self.spill_messages or not lines:
+            return
+        game_id = self.engine.game_id
+        filename = f"session_{game_id}_messages.log" if game_id else "messages.log"
+        path = os.path.join(self.engine.session_manager.data_dir, filename)
+        try:
+            if not game_id and os.path.exists(path) and os.path.getsize(path) > self.MESSAGE_LOG_MAX_BYTES:
+                os.replace(path, path + ".1")
+            with open(path, 'a', encoding='utf-8') as log_file:
+                log_file.write("\n".join(lines) + "\n")
+        except IOError as e:
+            print(f"Błąd zapisu logu wiadomości: {e}")
+
+    def wait_for_input(self):
+        self.input_released = False
+        self.input_loop = QEventLoop()
+        self.input_loop.exec_()
+        self.input_loop = None
+        if not self.input_released:
+            self.abandon_input()
+
+    def release_input(self):
+        self.input_released = True
+        if self.input_loop is not None:
+            self.input_loop.quit()
+
+    def abandon_input(self):
+        if self.engine.waiting_for_exchange:
+            self.engine.set_exchange_indices([])
+        if self.engine.waiting_for_raise:
+            self.engine.set_raise_amount(self.engine.big_blind)
+        if self.engine.waiting_for_action:
+            self.engine.set_player_action('fold')
 
     def request_player_action(self, player, current_bet):
         self.exchange_phase = False
@@ -543,6 +933,7 @@ class PokerGUI(QMainWindow):
             QTimer.singleShot(3000, self.enable_new_round)
 
     def show_game_over(self):
+        self.end_fast_forward()
         winner = max(self.players, key=lambda p: p.get_stack_amount())
         QMessageBox.information(
             self,
@@ -573,6 +964,10 @@ class PokerGUI(QMainWindow):
         else:
             indices = self.selected_cards.copy()
 
+        human = next(p for p in self.players if p.is_human())
+        self.discarded_cards = [human.get_hand()[i] for i in indices]
+        self.hand_drawn = True
+        self.cancel_equity()
         self.engine.set_exchange_indices(indices)
         self.add_message(f"Exchanged {len(indices)} cards")
 
@@ -590,11 +985,13 @@ class PokerGUI(QMainWindow):
                 player.set_stack_amount(self.config["starting_chips"])
             self.game_over = False
 
-        self.messages.clear()
+        self.clear_messages()
         self.add_message("Starting new round...")
         self.selected_cards = []
         self.exchange_phase = False
         self.last_click_time = 0
+        self.hand_drawn = False
+        self.discarded_cards = []
 
         self.clear_card_scene()
         self.btn_new_round.setEnabled(False)
@@ -653,6 +1050,15 @@ class PokerGUI(QMainWindow):
         skin_combo.setCurrentText(self.config.get("skin", "Rust"))
         layout.addRow("Card Skin:", skin_combo)
 
+        policy_combo = QComboBox()
+        policy_combo.addItems(["default"] + list(POLICIES))
+        policy_combo.setCurrentText(self.config["bot_policy"])
+        layout.addRow("Bot Strategy:", policy_combo)
+
+        equity_check = QCheckBox("Show win probability and best discard")
+        equity_check.setChecked(self.config["equity_hud"])
+        layout.addRow("Equity HUD:", equity_check)
+
         button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         layout.addWidget(button_box)
 
@@ -671,6 +1077,8 @@ class PokerGUI(QMainWindow):
 
             # Save skin choice
             self.config["skin"] = skin_combo.currentText()
+            self.config["equity_hud"] = equity_check.isChecked()
+            self.config["bot_policy"] = policy_combo.currentText()
 
             save_config(self.config)
             dialog.accept()
@@ -680,11 +1088,46 @@ class PokerGUI(QMainWindow):
 
         dialog.exec_()
 
+    def on_config_changed(self, config, changed):
+        self.config = config
+        if "skin" in changed:
+            card_cache.preload(config["skin"])
+        if changed & {"small_blind", "big_blind"}:
+            self.engine.small_blind = config["small_blind"]
+            self.engine.big_blind = config["big_blind"]
+            self.add_message(f"Blinds changed: Small ${config['small_blind']}, Big ${config['big_blind']}")
+        if "bot_cache_size" in changed:
+            self.decision_cache.max_size = config["bot_cache_size"]
+        if changed & {"bot_policy", "bot_deadline_ms"}:
+            self.decision_cache.clear()
+            self.engine.bot_policy = self.create_bot_policy(config)
+        if "equity_hud" in changed:
+            self.equity_label.setVisible(config["equity_hud"])
+            self.update_equity_hud()
+
+    def create_bot_policy(self, config):
+        return create_policy(config["bot_policy"], deadline=config["bot_deadline_ms"] / 1000,
+                             cache=self.decision_cache if config["bot_cache_size"] else None)
+
+    def check_config(self):
+        self.config_service.check()
+
+    def closeEvent(self, event):
+        self.config_service.unsubscribe(self.on_config_changed)
+        self.cancel_equity()
+        self.equity_pool.waitForDone(1000)
+        try:
+            self.decision_cache.save()
+        except IOError:
+            pass
+        super().closeEvent(event)
+
     def restart_game_from_config(self):
         self.clear_card_scene()
-        self.messages.clear()
+        self.clear_messages()
         self.btn_new_round.setEnabled(False)
 
+        self.session = None
         self.setup_game_from_config()
         self.update_all_displays()
         self.game_over = False
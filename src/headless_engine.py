@@ -0,0 +1,175 @@
+import random
+from typing import List
+
+from src.deck import Deck
+from src.equity import encode_card, hand_value, planned_discard, value_category
+from src.game_engine import GameEngine
+from src.player import Player
+
+
+class HeadlessGameEngine(GameEngine):
+    def __init__(self, players: List[Player], deck: Deck = None, small_blind: int = 25, big_blind: int = 50,
+                 bot_policy=None, rng: random.Random = None, max_raises: int = 10):
+        super().__init__(players, deck or Deck(), small_blind, big_blind)
+        self.bot_policy = bot_policy
+        self.rng = rng or random.Random()
+        self.max_raises = max_raises
+        self.button = -1
+        self.first_to_act = 0
+        self.hands_played = 0
+
+    def _create_session_manager(self):
+        return None
+
+    def _save_round(self, winner: Player, pot_amount: int) -> None:
+        pass
+
+    def snapshot(self):
+        return super().snapshot(), self.button, self.first_to_act, self.hands_played
+
+    def restore(self, state) -> None:
+        engine_state, self.button, self.first_to_act, self.hands_played = state
+        super().restore(engine_state)
+
+    def seated_players(self) -> List[Player]:
+        return [p for p in self.players if p.get_stack_amount() > 0]
+
+    def play_round(self):
+        hand = self.play_hand()
+        try:
+            request = next(hand)
+            while True:
+                request = hand.send(self.answer(request))
+        except StopIteration as stop:
+            return stop.value
+
+    def answer(self, request):
+        kind, player, to_call = request
+        if kind == "bet":
+            return self._bot_decide_action(player, to_call)
+        return self._bot_discard(player)
+
+    def play_hand(self):
+        seated = self.seated_players()
+        if len(seated) < 2:
+            return None
+
+        self._reset_round()
+        for player in self.players:
+            if player.get_stack_amount() <= 0:
+                player.folded = True
+        self._post_blinds()
+
+        self.rng.shuffle(self.deck.cards)
+        self.deck.deal(seated, 5)
+
+        self.current_stage = "betting"
+        yield from self.betting_round()
+
+        active = [p for p in self.players if not p.folded]
+        if len(active) > 1:
+            self.current_stage = "exchange"
+            for player in active:
+                indices = yield ("draw", player, None)
+                self._record_draw(player, len(indices))
+                if indices:
+                    player.set_hand(self.exchange_cards(player.get_hand(), list(indices)))
+
+        self.current_stage = "showdown"
+        active = [p for p in self.players if not p.folded]
+        if len(active) > 1:
+            values = {p: hand_value([encode_card(card) for card in p.get_hand()]) for p in active}
+            winner = max(active, key=lambda p: values[p])
+            best = values[winner]
+            for player in active:
+                self.opponent_model.record_showdown(player.get_name(), value_category(values[player]),
+                                                    values[player] == best)
+        else:
+            winner = active[0]
+
+        winner.set_stack_amount(winner.get_stack_amount() + self.pot)
+        self.pot = 0
+        self.current_bet = 0
+        self.hands_played += 1
+        return winner
+
+    def _post_blinds(self):
+        seated = [i for i, p in enumerate(self.players) if p.get_stack_amount() > 0]
+        self.button = next((i for i in seated if i > self.button), seated[0])
+        start = seated.index(self.button)
+        order = seated[start:] + seated[:start]
+        if len(order) == 2:
+            blinds = [(order[0], self.small_blind), (order[1], self.big_blind)]
+            self.first_to_act = order[0]
+        else:
+            blinds = [(order[1], self.small_blind), (order[2], self.big_blind)]
+            self.first_to_act = order[3 % len(order)]
+
+        self.current_bet = 0
+        for index, blind in blinds:
+            player = self.players[index]
+            paid = player.pay(min(blind, player.get_stack_amount()))
+            self.pot += paid
+            player.current_bet += paid
+            self.blinds[index] = paid
+            self.current_bet = max(self.current_bet, player.current_bet)
+
+    def betting_round(self):
+        for player in self.players:
+            player.last_action = None
+
+        seating = self.players[self.first_to_act:] + self.players[:self.first_to_act]
+        to_act = [p for p in seating if not p.folded and p.get_stack_amount() > 0]
+        raises = 0
+        while to_act:
+            player = to_act.pop(0)
+            if player.folded or player.get_stack_amount() <= 0:
+                continue
+            if len([p for p in self.players if not p.folded]) < 2:
+                return
+
+            self.current_player = player
+            to_call = max(0, self.current_bet - player.current_bet)
+            bet_before = player.current_bet
+            action = yield ("bet", player, to_call)
+            if action == 'raise' and raises >= self.max_raises:
+                action = 'call'
+
+            if action == 'raise':
+                total = min(to_call + self._get_raise_amount(to_call), player.get_stack_amount())
+                self.pot += player.pay(total)
+                player.current_bet += total
+                if player.current_bet > self.current_bet:
+                    self.current_bet = player.current_bet
+                    raises += 1
+                    position = seating.index(player)
+                    to_act = [p for p in seating[position + 1:] + seating[:position]
+                              if not p.folded and p.get_stack_amount() > 0]
+            elif action == 'call' and to_call > 0:
+                paid = player.pay(min(to_call, player.get_stack_amount()))
+                self.pot += paid
+                player.current_bet += paid
+            elif action in ('call', 'check') and to_call == 0:
+                action = 'check'
+            else:
+                action = 'fold'
+                player.folded = True
+
+            player.last_action = action
+            self._record_bet(player, action, player.current_bet - bet_before)
+
+    def _get_raise_amount(self, current_bet):
+        player = self.current_player
+        if self.bot_policy is not None:
+            amount = self.bot_policy.raise_amount(self, player, current_bet)
+            if amount is not None:
+                return amount
+        max_raise = min(player.get_stack_amount() - current_bet, self.big_blind * 4)
+        if max_raise >= self.big_blind:
+            return self.rng.randint(self.big_blind, max_raise)
+        return self.big_blind
+
+    def _bot_discard(self, player: Player):
+        if self.bot_policy is not None:
+            return self.bot_policy.discard(self, player)
+        return planned_discard([encode_card(card) for card in player.get_hand()])
@@ -0,0 +1,207 @@
+import argparse
+import os
+import random
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.deck import Deck
+from src.equity import (CARD_PRIMES, CARD_SUIT_BITS, MAX_DISCARD, decode_card, encode_card, get_tables,
+                        keep_order, lookup_values)
+from src.utils import evaluate_hand, hand_rank_names
+
+KNOWN_CATEGORY_COUNTS = [1302540, 1098240, 123552, 54912, 10200, 5108, 3744, 624, 40]
+
+
+class CategoryBatch:
+    def __init__(self):
+        self.products = array('I')
+        self.flushes = array('B')
+
+    def add(self, codes):
+        a, b, c, d, e = codes
+        self.products.append(CARD_PRIMES[a] * CARD_PRIMES[b] * CARD_PRIMES[c] * CARD_PRIMES[d] * CARD_PRIMES[e])
+        self.flushes.append(CARD_SUIT_BITS[a] & CARD_SUIT_BITS[b] & CARD_SUIT_BITS[c] & CARD_SUIT_BITS[d]
+                            & CARD_SUIT_BITS[e])
+
+    def counts(self):
+        categories = get_tables()[2][lookup_values(self.products, self.flushes)]
+        return np.bincount(categories, minlength=len(KNOWN_CATEGORY_COUNTS)).tolist()
+
+
+class OracleCounts:
+    def __init__(self):
+        self.categories = [0] * len(KNOWN_CATEGORY_COUNTS)
+
+    def add(self, codes):
+        self.categories[evaluate_hand([decode_card(code) for code in codes])[0]] += 1
+
+    def counts(self):
+        return self.categories
+
+
+def empty_counts(post_draw):
+    return [[0] * len(KNOWN_CATEGORY_COUNTS) for _ in range(MAX_DISCARD + 1 if post_draw else 1)]
+
+
+def new_rows(post_draw, oracle):
+    row = OracleCounts if oracle else CategoryBatch
+    return [row() for _ in range(MAX_DISCARD + 1 if post_draw else 1)]
+
+
+def tally_draws(rows, codes, rng):
+    ordered = keep_order(codes)
+    held = set(codes)
+    replacements = [code for code in rng.sample(range(52), 5 + MAX_DISCARD) if code not in held]
+    for discard in range(1, MAX_DISCARD + 1):
+        rows[discard].add(ordered[:5 - discard] + replacements[:discard])
+
+
+def enumerate_first(first, post_draw=False, oracle=False, seed=None):
+    rows = new_rows(post_draw, oracle)
+    rng = random.Random(seed)
+
+    if oracle or post_draw:
+        for b in range(first + 1, 49):
+            for c in range(b + 1, 50):
+                for d in range(c + 1, 51):
+                    for e in range(d + 1, 52):
+                        codes = [first, b, c, d, e]
+                        rows[0].add(codes)
+                        if post_draw:
+                            tally_draws(rows, codes, rng)
+        return [row.counts() for row in rows]
+
+    pre_draw = rows[0]
+    append_product = pre_draw.products.append
+    append_flush = pre_draw.flushes.append
+    primes = CARD_PRIMES
+    bits = CARD_SUIT_BITS
+    for b in range(first + 1, 49):
+        product_b = primes[first] * primes[b]
+        bits_b = bits[first] & bits[b]
+        for c in range(b + 1, 50):
+            product_c = product_b * primes[c]
+            bits_c = bits_b & bits[c]
+            for d in range(c + 1, 51):
+                product_d = product_c * primes[d]
+                bits_d = bits_c & bits[d]
+                for e in range(d + 1, 52):
+                    append_product(product_d * primes[e])
+                    append_flush(bits_d & bits[e])
+    return [pre_draw.counts()]
+
+
+def sample_deals(deals, post_draw=False, oracle=False, seed=None):
+    rows = new_rows(post_draw, oracle)
+    rng = random.Random(seed)
+    deck = Deck()
+    card_codes = {card: encode_card(card) for card in deck.cards}
+    for _ in range(deals):
+        rng.shuffle(deck.cards)
+        codes = [card_codes[card] for card in deck.cards[-5:]]
+        rows[0].add(codes)
+        if post_draw:
+            ordered = keep_order(codes)
+            replacements = [card_codes[card] for card in deck.cards[:MAX_DISCARD]]
+            for discard in range(1, MAX_DISCARD + 1):
+                rows[discard].add(ordered[:5 - discard] + replacements[:discard])
+    return [row.counts() for row in rows]
+
+
+class HandHistogram:
+    def __init__(self, post_draw=False, exhaustive=True):
+        self.counts = empty_counts(post_draw)
+        self.exhaustive = exhaustive
+        self.elapsed = 0.0
+
+    def add(self, counts):
+        for row, extra in zip(self.counts, counts):
+            for category, count in enumerate(extra):
+                row[category] += count
+
+    def hands(self):
+        return sum(self.counts[0])
+
+    def hands_per_second(self):
+        return self.hands() / self.elapsed if self.elapsed else 0.0
+
+    def mismatches(self):
+        if not self.exhaustive:
+            return []
+        return [(category, count, expected)
+                for category, (count, expected) in enumerate(zip(self.counts[0], KNOWN_CATEGORY_COUNTS))
+                if count != expected]
+
+    def __str__(self):
+        hands = self.hands()
+        header = f"{'Układ':<16}{'Rozdanie':>12}{'%':>9}"
+        for discard in range(1, len(self.counts)):
+            header += f"{f'Wymiana {discard}':>12}"
+        lines = [header]
+        for category in range(len(KNOWN_CATEGORY_COUNTS) - 1, -1, -1):
+            line = f"{hand_rank_names[category]:<16}{self.counts[0][category]:>12}"
+            line += f"{self.counts[0][category] / hands if hands else 0.0:>9.4%}"
+            for row in self.counts[1:]:
+                line += f"{row[category] / hands if hands else 0.0:>12.4%}"
+            lines.append(line)
+        lines.append(f"{hands} rąk w {self.elapsed:.2f}s ({self.hands_per_second():.0f} rąk/s)")
+        return "\n".join(lines)
+
+
+def build_histogram(deals=None, post_draw=False, oracle=False, workers=1, chunk_size=50000, seed=None):
+    rng = random.Random(seed)
+    if deals is None:
+        jobs = [(enumerate_first, (first, post_draw, oracle, rng.getrandbits(64))) for first in range(48)]
+    else:
+        jobs = []
+        for start in range(0, deals, chunk_size):
+            jobs.append((sample_deals, (min(chunk_size, deals - start), post_draw, oracle, rng.getrandbits(64))))
+
+    result = HandHistogram(post_draw, exhaustive=deals is None)
+    start = time.perf_counter()
+    if workers <= 1:
+        for function, job_args in jobs:
+            result.add(function(*job_args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(function, *job_args) for function, job_args in jobs]
+            for future in futures:
+                result.add(future.result())
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Histogram układów pokerowych: pełne wyliczenie wszystkich rąk "
+                                                 "albo losowe rozdania z talii")
+    parser.add_argument("--samples", type=int, help="liczba losowych rozdań zamiast pełnego wyliczenia")
+    parser.add_argument("--post-draw", action="store_true",
+                        help="dolicz histogramy po wymianie 1-3 najsłabszych kart")
+    parser.add_argument("--oracle", action="store_true",
+                        help="oceniaj każdą rękę przez evaluate_hand zamiast tablic (wolno)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--check", action="store_true",
+                        help="zakończ z błędem, jeśli pełne wyliczenie nie zgadza się ze znanymi liczbami")
+    args = parser.parse_args()
+
+    result = build_histogram(args.samples, args.post_draw, args.oracle, args.workers, seed=args.seed)
+    print(result)
+
+    mismatches = result.mismatches()
+    for category, count, expected in mismatches:
+        print(f"Niezgodność dla {hand_rank_names[category]}: {count} zamiast {expected}")
+    if args.check:
+        if not result.exhaustive:
+            print("Sprawdzenie wymaga pełnego wyliczenia (bez --samples)")
+            sys.exit(2)
+        if mismatches:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,27 @@
+from src.startup_timing import startup_timer
+
 import sys
-import json
-import os
+import time
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QPushButton, QDialog,
-    QFormLayout, QSpinBox, QDialogButtonBox, QMessageBox
+    QFormLayout, QSpinBox, QDialogButtonBox, QMessageBox,
+    QLineEdit, QListWidget, QListWidgetItem
 )
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QColor
 
-from game_gui import PokerGUI
-from src.player import Player
-from src.deck import Deck
-from src.game_engine import GameEngine
+from src import config as config_service
 
-CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'config.json')
+startup_timer.mark('import')
 
 
 def load_config():
-    if os.path.exists(CONFIG_PATH):
-        try:
-            with open(CONFIG_PATH, 'r') as f:
-                return json.load(f)
-        except Exception:
-            pass
-    return {
-        'num_bots': 1,
-        'small_blind': 25,
-        'big_blind': 50,
-        'starting_stack': 100
-    }
+    return config_service.load_config()
 
 
 def save_config(cfg):
     try:
-        with open(CONFIG_PATH, 'w') as f:
-            json.dump(cfg, f, indent=4)
+        cfg.update(config_service.save_config(cfg))
     except Exception as e:
         QMessageBox.warning(None, 'Error', f'Could not save config: {e}')
 
@@ -63,7 +50,7 @@ class SettingsDialog(QDialog):
 
         self.st_spin = QSpinBox(self)
         self.st_spin.setRange(1, 1000000)
-        self.st_spin.setValue(cfg.get('starting_stack', 100))
+        self.st_spin.setValue(cfg['starting_chips'])
         layout.addRow('Początkowy stack:', self.st_spin)
 
         buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel, self)
@@ -81,11 +68,54 @@ class SettingsDialog(QDialog):
         self.cfg['num_bots'] = self.bot_spin.value()
         self.cfg['small_blind'] = sb
         self.cfg['big_blind'] = bb
-        self.cfg['starting_stack'] = self.st_spin.value()
+        self.cfg['starting_chips'] = self.st_spin.value()
         save_config(self.cfg)
         self.accept()
 
 
+class LoadGameDialog(QDialog):
+    def __init__(self, session_manager, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle('Wczytaj Grę')
+        self.resize(600, 400)
+        self.session_manager = session_manager
+        layout = QVBoxLayout(self)
+
+        self.search = QLineEdit(self)
+        self.search.setPlaceholderText('Szukaj (id, data, gracz)...')
+        self.search.textChanged.connect(self.refresh)
+        layout.addWidget(self.search)
+
+        self.list = QListWidget(self)
+        self.list.itemDoubleClicked.connect(self.accept)
+        layout.addWidget(self.list)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel, self)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+        self.refresh()
+
+    def refresh(self):
+        self.list.clear()
+        for entry in self.session_manager.list_sessions(self.search.text()):
+            item = QListWidgetItem(self.describe(entry), self.list)
+            item.setData(Qt.UserRole, entry['game_id'])
+        if self.list.count():
+            self.list.setCurrentRow(0)
+
+    @staticmethod
+    def describe(entry):
+        stacks = ', '.join(f'{name} ${stack}' for name, stack in zip(entry['players'], entry['stacks']))
+        timestamp = (entry.get('timestamp') or '').replace('T', ' ')
+        return f"#{entry['game_id']}  {timestamp}  rund: {entry['rounds']}  |  {stacks}"
+
+    def selected_game_id(self):
+        item = self.list.currentItem()
+        return item.data(Qt.UserRole) if item else None
+
+
 class MainMenu(QWidget):
     def __init__(self):
         super().__init__()
@@ -101,6 +131,8 @@ class MainMenu(QWidget):
         layout.setContentsMargins(50, 50, 50, 50)
 
         self.config = load_config()
+        startup_timer.mark('config')
+        self.first_paint_done = False
 
         btn_new = QPushButton('Nowa Gra', self)
         btn_new.setFixedHeight(60)
@@ -126,32 +158,62 @@ class MainMenu(QWidget):
         btn_exit.clicked.connect(QApplication.quit)
         layout.addWidget(btn_exit, alignment=Qt.AlignCenter)
 
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.first_paint_done:
+            self.first_paint_done = True
+            startup_timer.finish('first paint')
+
     def open_settings(self):
         dlg = SettingsDialog(self.config, self)
         dlg.exec_()
 
     def start_game(self):
+        from src.player import Player
+
         bots = self.config.get('num_bots', 1)
-        starting = self.config.get('starting_stack', 100)
+        starting = self.config['starting_chips']
 
         players = [Player(starting, 'Gracz 1', True)]
 
         for i in range(bots):
             players.append(Player(starting, f'Bot {i+1}', False))
-        deck = Deck()
-        engine = GameEngine(players, deck,
-                            self.config.get('small_blind', 25),
-                            self.config.get('big_blind', 50))
-        self.poker = PokerGUI(engine)
-        self.poker.show()
-        self.hide()
+        self.open_game_window({'game_id': None, 'players': players})
 
     def load_game(self):
-        QMessageBox.information(self, 'Wczytaj Grę', 'Funkcja w przygotowaniu.')
+        from src.fileops.session_manager import SessionManager
+
+        session_manager = SessionManager()
+        dlg = LoadGameDialog(session_manager, self)
+        if not dlg.exec_() or dlg.selected_game_id() is None:
+            return
+
+        try:
+            session = session_manager.load_session(dlg.selected_game_id())
+        except (IOError, ValueError) as e:
+            QMessageBox.warning(self, 'Wczytaj Grę', f'Nie udało się wczytać gry: {e}')
+            return
+
+        if not any(p.is_human() for p in session['players']):
+            QMessageBox.warning(self, 'Wczytaj Grę', 'Ta sesja nie ma gracza-człowieka.')
+            return
+
+        self.open_game_window(session)
+
+    def open_game_window(self, session):
+        start = time.perf_counter()
+        from game_gui import PokerGUI
+
+        self.poker = PokerGUI(session)
+        self.poker.show()
+        self.hide()
+        if startup_timer.enabled:
+            print(f"Game window opened in {(time.perf_counter() - start) * 1000:.1f} ms")
 
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
+    startup_timer.mark('qapplication')
     menu = MainMenu()
     menu.show()
     sys.exit(app.exec_())
@@ -0,0 +1,169 @@
+class OpponentStats:
+    MAX_DRAW = 5
+
+    def __init__(self):
+        self.hands = 0
+        self.vpip_hands = 0
+        self.actions = 0
+        self.calls = 0
+        self.raises = 0
+        self.checks = 0
+        self.folds = 0
+        self.draw_counts = [0] * (self.MAX_DRAW + 1)
+        self.showdowns = 0
+        self.showdowns_won = 0
+        self.showdown_rank_total = 0
+        self._voluntary = False
+
+    def start_hand(self):
+        self.hands += 1
+        self._voluntary = False
+
+    def record_action(self, action):
+        self.actions += 1
+        if action == 'call':
+            self.calls += 1
+        elif action == 'raise':
+            self.raises += 1
+        elif action == 'check':
+            self.checks += 1
+        elif action == 'fold':
+            self.folds += 1
+
+        if action in ('call', 'raise') and not self._voluntary:
+            self._voluntary = True
+            self.vpip_hands += 1
+
+    def record_draw(self, count):
+        count = max(0, min(count, self.MAX_DRAW))
+        self.draw_counts[count] += 1
+
+    def record_showdown(self, rank_value, won):
+        self.showdowns += 1
+        self.showdown_rank_total += rank_value
+        if won:
+            self.showdowns_won += 1
+
+    def snapshot(self):
+        return (self.hands, self.vpip_hands, self.actions, self.calls, self.raises, self.checks, self.folds,
+                tuple(self.draw_counts), self.showdowns, self.showdowns_won, self.showdown_rank_total,
+                self._voluntary)
+
+    def restore(self, state):
+        (self.hands, self.vpip_hands, self.actions, self.calls, self.raises, self.checks, self.folds,
+         draw_counts, self.showdowns, self.showdowns_won, self.showdown_rank_total, self._voluntary) = state
+        self.draw_counts = list(draw_counts)
+
+    def vpip(self):
+        return self.vpip_hands / self.hands if self.hands else 0.0
+
+    def raise_rate(self):
+        return self.raises / self.actions if self.actions else 0.0
+
+    def fold_rate(self):
+        return self.folds / self.actions if self.actions else 0.0
+
+    def average_draw(self):
+        draws = sum(self.draw_counts)
+        if not draws:
+            return 0.0
+        return sum(count * n for count, n in enumerate(self.draw_counts)) / draws
+
+    def showdown_strength(self):
+        return self.showdown_rank_total / self.showdowns if self.showdowns else 0.0
+
+    def showdown_win_rate(self):
+        return self.showdowns_won / self.showdowns if self.showdowns else 0.0
+
+    def summary(self):
+        return (f"Hands: {self.hands} | VPIP: {self.vpip():.0%} | Raise: {self.raise_rate():.0%} | "
+                f"Avg draw: {self.average_draw():.1f} | Showdown: {self.showdown_strength():.1f} "
+                f"({self.showdown_win_rate():.0%} won)")
+
+    def to_dict(self):
+        return {
+            "hands": self.hands,
+            "vpip_hands": self.vpip_hands,
+            "actions": self.actions,
+            "calls": self.calls,
+            "raises": self.raises,
+            "checks": self.checks,
+            "folds": self.folds,
+            "draw_counts": list(self.draw_counts),
+            "showdowns": self.showdowns,
+            "showdowns_won": self.showdowns_won,
+            "showdown_rank_total": self.showdown_rank_total
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        for key, value in data.items():
+            if key == "draw_counts":
+                counts = list(value)[:cls.MAX_DRAW + 1]
+                stats.draw_counts = counts + [0] * (cls.MAX_DRAW + 1 - len(counts))
+            elif hasattr(stats, key):
+                setattr(stats, key, value)
+        return stats
+
+
+class OpponentModel:
+    def __init__(self):
+        self.stats = {}
+        self.changed = set()
+
+    def get(self, name):
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = OpponentStats()
+            self.stats[name] = stats
+        return stats
+
+    def start_hand(self, players):
+        for player in players:
+            self.changed.add(player.get_name())
+            self.get(player.get_name()).start_hand()
+
+    def record_action(self, name, action):
+        self.changed.add(name)
+        self.get(name).record_action(action)
+
+    def record_draw(self, name, count):
+        self.changed.add(name)
+        self.get(name).record_draw(count)
+
+    def record_showdown(self, name, rank_value, won):
+        self.changed.add(name)
+        self.get(name).record_showdown(rank_value, won)
+
+    def snapshot(self):
+        return tuple((name, stats.snapshot()) for name, stats in self.stats.items()), frozenset(self.changed)
+
+    def restore(self, state):
+        stats, changed = state
+        names = set()
+        for name, stats_state in stats:
+            self.get(name).restore(stats_state)
+            names.add(name)
+        for name in set(self.stats) - names:
+            del self.stats[name]
+        self.changed = set(changed)
+
+    def pop_changes(self):
+        changes = {name: self.stats[name].to_dict() for name in self.changed if name in self.stats}
+        self.changed.clear()
+        return changes
+
+    def apply_changes(self, changes):
+        for name, stats in changes.items():
+            self.stats[name] = OpponentStats.from_dict(stats)
+
+    def to_dict(self):
+        return {name: stats.to_dict() for name, stats in self.stats.items()}
+
+    @classmethod
+    def from_dict(cls, data):
+        model = cls()
+        for name, stats in (data or {}).items():
+            model.stats[name] = OpponentStats.from_dict(stats)
+        return model
@@ -60,6 +60,13 @@ class Player:
     def set_last_action(self, action):
         self.last_action = action
 
+    def snapshot(self):
+        return (self.__stack_, tuple(self.__hand_), self.folded, self.current_bet, self.last_action)
+
+    def restore(self, state):
+        self.__stack_, hand, self.folded, self.current_bet, self.last_action = state
+        self.__hand_ = list(hand)
+
     def validate_hand(self):
         if len(self.__hand_) != 5:
             raise InvalidHandError("renka nie ma 5 kart.")
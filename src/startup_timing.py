@@ -0,0 +1,36 @@
+import os
+import sys
+import time
+
+STARTUP_TARGET_MS = 400
+
+
+class StartupTimer:
+    def __init__(self, target_ms=STARTUP_TARGET_MS):
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.target_ms = target_ms
+        self.marks = []
+        self.enabled = "--timing" in sys.argv or os.environ.get("POKER_STARTUP_TIMING") == "1"
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.marks.append((name, (now - self.last) * 1000, (now - self.start) * 1000))
+        self.last = now
+
+    def report(self):
+        lines = ["--- Startup timing ---"]
+        for name, step_ms, total_ms in self.marks:
+            lines.append(f"{name:<14} {step_ms:8.1f} ms  (total {total_ms:8.1f} ms)")
+        total = self.marks[-1][2] if self.marks else 0.0
+        verdict = "OK" if total <= self.target_ms else "OVER TARGET"
+        lines.append(f"target         {self.target_ms:8.1f} ms  -> {verdict}")
+        return "\n".join(lines)
+
+    def finish(self, name):
+        self.mark(name)
+        if self.enabled:
+            print(self.report())
+
+
+startup_timer = StartupTimer()
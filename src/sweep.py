@@ -0,0 +1,222 @@
+import argparse
+import itertools
+import json
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from src.bot_policy import POLICIES, create_policy
+from src.config import normalize_config
+from src.headless_engine import HeadlessGameEngine
+from src.player import Player
+
+SWEEP_KEYS = ["small_blind", "big_blind", "starting_chips", "num_bots", "bot_policy", "bot_deadline_ms"]
+
+
+def parse_value(text):
+    try:
+        return int(text)
+    except ValueError:
+        return text
+
+
+def load_grid(path=None, assignments=()):
+    grid = {}
+    if path:
+        try:
+            with open(path, 'r', encoding='utf-8') as grid_file:
+                grid.update(json.load(grid_file))
+        except (IOError, json.JSONDecodeError) as e:
+            print(f"Błąd odczytu siatki parametrów: {e}")
+            raise
+    for assignment in assignments:
+        key, _, values = assignment.partition("=")
+        grid[key] = [parse_value(value) for value in values.split(",") if value]
+
+    unknown = [key for key in grid if key not in SWEEP_KEYS]
+    if unknown:
+        raise ValueError(f"Nieznane parametry siatki: {', '.join(unknown)}")
+    return {key: values if isinstance(values, list) else [values] for key, values in grid.items()}
+
+
+def grid_cells(grid):
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+
+def cell_key(cell):
+    return json.dumps(cell, sort_keys=True)
+
+
+def validate_cell(cell):
+    config = normalize_config(cell)
+    changed = [key for key in cell if config[key] != cell[key]]
+    if changed:
+        raise ValueError(f"Wartości poza zakresem konfiguracji w {cell_key(cell)}: "
+                         + ", ".join(f"{key}={cell[key]} -> {config[key]}" for key in changed))
+    if config["num_bots"] < 1:
+        raise ValueError(f"Symulacja wymaga co najmniej jednego bota: {cell_key(cell)}")
+    if config["bot_policy"] not in POLICIES and config["bot_policy"] != "default":
+        raise ValueError(f"Nieznana strategia botów '{config['bot_policy']}'")
+    return config
+
+
+def run_cell(cell, runs=10, max_hands=500, seed=None):
+    config = validate_cell(cell)
+    rng = random.Random(f"{seed}:{cell_key(cell)}")
+    players = config["num_bots"] + 1
+
+    hands = 0
+    first_busts = []
+    finishes = []
+    results = []
+    started = time.perf_counter()
+    for _ in range(runs):
+        random.seed(rng.getrandbits(64))
+        seats = [Player(config["starting_chips"], f"Bot {seat + 1}") for seat in range(players)]
+        policy = create_policy(config["bot_policy"], deadline=config["bot_deadline_ms"] / 1000,
+                               rng=random.Random(rng.getrandbits(64)))
+        engine = HeadlessGameEngine(seats, small_blind=config["small_blind"], big_blind=config["big_blind"],
+                                    bot_policy=policy, rng=random.Random(rng.getrandbits(64)))
+
+        first_bust = None
+        while engine.hands_played < max_hands and len(engine.seated_players()) >= 2:
+            stacks = [player.get_stack_amount() for player in seats]
+            engine.play_round()
+            for player, before in zip(seats, stacks):
+                if before > 0:
+                    results.append(player.get_stack_amount() - before)
+            if first_bust is None and len(engine.seated_players()) < players:
+                first_bust = engine.hands_played
+
+        hands += engine.hands_played
+        if first_bust is not None:
+            first_busts.append(first_bust)
+        if len(engine.seated_players()) < 2:
+            finishes.append(engine.hands_played)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "cell": cell,
+        "config": {key: config[key] for key in SWEEP_KEYS},
+        "runs": runs,
+        "max_hands": max_hands,
+        "seed": seed,
+        "hands": hands,
+        "first_bust": statistics.mean(first_busts) if first_busts else None,
+        "busted_runs": len(first_busts),
+        "finish": statistics.mean(finishes) if finishes else None,
+        "finished_runs": len(finishes),
+        "chip_variance": statistics.pvariance(results) if results else 0.0,
+        "elapsed": elapsed,
+        "rounds_per_second": hands / elapsed if elapsed else 0.0
+    }
+
+
+def load_checkpoint(path):
+    results = {}
+    if not path or not os.path.exists(path):
+        return results
+    try:
+        with open(path, 'r', encoding='utf-8') as checkpoint_file:
+            for line in checkpoint_file:
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                results[cell_key(result["cell"])] = result
+    except IOError as e:
+        print(f"Błąd odczytu punktu kontrolnego: {e}")
+    return results
+
+
+def append_checkpoint(path, result):
+    try:
+        with open(path, 'a', encoding='utf-8') as checkpoint_file:
+            checkpoint_file.write(json.dumps(result, ensure_ascii=False) + "\n")
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+    except IOError as e:
+        print(f"Błąd zapisu punktu kontrolnego: {e}")
+        raise
+
+
+def run_sweep(grid, checkpoint_path, runs=10, max_hands=500, workers=1, seed=None):
+    cells = grid_cells(grid)
+    for cell in cells:
+        validate_cell(cell)
+
+    done = load_checkpoint(checkpoint_path)
+    for result in done.values():
+        if (result.get("runs"), result.get("max_hands"), result.get("seed")) != (runs, max_hands, seed):
+            raise ValueError(f"Punkt kontrolny {checkpoint_path} powstał z innymi parametrami "
+                             f"(runs={result.get('runs')}, max_hands={result.get('max_hands')}, "
+                             f"seed={result.get('seed')}); użyj innego pliku --checkpoint")
+    todo = [cell for cell in cells if cell_key(cell) not in done]
+    if len(todo) < len(cells):
+        print(f"Wznawiam: {len(cells) - len(todo)} z {len(cells)} komórek już policzonych")
+
+    if workers <= 1:
+        for cell in todo:
+            result = run_cell(cell, runs, max_hands, seed)
+            append_checkpoint(checkpoint_path, result)
+            done[cell_key(cell)] = result
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_cell, cell, runs, max_hands, seed) for cell in todo]
+            for future in as_completed(futures):
+                result = future.result()
+                append_checkpoint(checkpoint_path, result)
+                done[cell_key(result["cell"])] = result
+    return [done[cell_key(cell)] for cell in cells]
+
+
+def format_table(grid, results):
+    keys = list(grid)
+    columns = keys + ["do 1. bankructwa", "do końca", "wariancja żetonów", "rozdań/s"]
+    rows = []
+    for result in results:
+        first_bust = result["first_bust"]
+        finish = result["finish"]
+        rows.append([str(result["cell"][key]) for key in keys] + [
+            f"{first_bust:.1f} ({result['busted_runs']}/{result['runs']})" if first_bust is not None else "-",
+            f"{finish:.1f} ({result['finished_runs']}/{result['runs']})" if finish is not None else "-",
+            f"{result['chip_variance']:.0f}",
+            f"{result['rounds_per_second']:.0f}"
+        ])
+    widths = [max(len(column), *(len(row[i]) for row in rows)) if rows else len(column)
+              for i, column in enumerate(columns)]
+    lines = ["  ".join(column.rjust(width) for column, width in zip(columns, widths))]
+    lines.extend("  ".join(value.rjust(width) for value, width in zip(row, widths)) for row in rows)
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Przeszukuje siatkę ustawień gry w symulacjach bez GUI")
+    parser.add_argument("--grid", help="plik JSON z listami wartości, np. {\"big_blind\": [50, 100]}")
+    parser.add_argument("--set", action="append", default=[], metavar="KLUCZ=W1,W2",
+                        help=f"wartości parametru ({', '.join(SWEEP_KEYS)})")
+    parser.add_argument("--checkpoint", default="sweep_results.jsonl", help="plik wyników do wznawiania")
+    parser.add_argument("--runs", type=int, default=10, help="gier na komórkę")
+    parser.add_argument("--max-hands", type=int, default=500, help="limit rozdań na grę")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    grid = load_grid(args.grid, args.set)
+    if not grid:
+        parser.error("podaj siatkę przez --grid lub --set")
+
+    started = time.perf_counter()
+    try:
+        results = run_sweep(grid, args.checkpoint, args.runs, args.max_hands, args.workers, args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+    print(format_table(grid, results))
+    print(f"{len(results)} komórek w {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
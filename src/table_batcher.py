@@ -0,0 +1,132 @@
+import argparse
+import random
+import time
+
+from src.bot_policy import POLICIES, RandomPolicy
+from src.headless_engine import HeadlessGameEngine
+from src.player import Player
+
+
+class TableBatcher:
+    def __init__(self, engines, policy=None, max_hands=None):
+        self.engines = list(engines)
+        self.policy = policy or RandomPolicy()
+        self.max_hands = max_hands
+        self.hands = {}
+        self.pending = {}
+        self.ticks = 0
+        self.decisions = 0
+        self.hands_finished = 0
+
+        for engine in self.engines:
+            engine.bot_policy = self.policy
+            self._start(engine)
+
+    def run(self):
+        while self.pending:
+            self.tick()
+
+    def tick(self):
+        bets = []
+        draws = []
+        for engine, (kind, player, to_call) in self.pending.items():
+            if kind == "bet":
+                bets.append((engine, player, to_call))
+            else:
+                draws.append((engine, player))
+
+        answers = []
+        if bets:
+            answers.extend(zip((engine for engine, _, _ in bets), self.policy.decide_batch(bets)))
+        if draws:
+            answers.extend(zip((engine for engine, _ in draws), self.policy.discard_batch(draws)))
+
+        for engine, answer in answers:
+            self._advance(engine, answer)
+        self.ticks += 1
+        self.decisions += len(answers)
+        return len(answers)
+
+    def _start(self, engine):
+        while self.max_hands is None or engine.hands_played < self.max_hands:
+            if len(engine.seated_players()) < 2:
+                break
+            self.hands[engine] = engine.play_hand()
+            try:
+                self.pending[engine] = next(self.hands[engine])
+                return
+            except StopIteration:
+                self.hands_finished += 1
+        self.hands.pop(engine, None)
+
+    def _advance(self, engine, answer):
+        try:
+            self.pending[engine] = self.hands[engine].send(answer)
+        except StopIteration:
+            del self.pending[engine]
+            self.hands_finished += 1
+            self._start(engine)
+
+
+def play_unbatched(engine):
+    decisions = 0
+    hand = engine.play_hand()
+    try:
+        request = next(hand)
+        while True:
+            decisions += 1
+            request = hand.send(engine.answer(request))
+    except StopIteration:
+        return decisions
+
+
+def create_tables(count, players, stack, small_blind, big_blind, seed=None):
+    rng = random.Random(seed)
+    engines = []
+    for table in range(count):
+        seats = [Player(stack, f"Bot {table + 1}-{seat + 1}") for seat in range(players)]
+        engines.append(HeadlessGameEngine(seats, small_blind=small_blind, big_blind=big_blind,
+                                          rng=random.Random(rng.getrandbits(64))))
+    return engines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rozgrywa wiele stołów botów naraz z grupowaniem decyzji")
+    parser.add_argument("--tables", type=int, default=200)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--hands", type=int, default=20, help="rozdań na stół")
+    parser.add_argument("--stack", type=int, default=1000)
+    parser.add_argument("--small-blind", type=int, default=25)
+    parser.add_argument("--big-blind", type=int, default=50)
+    parser.add_argument("--policy", choices=list(POLICIES), default="random")
+    parser.add_argument("--deadline-ms", type=float, default=50, help="budżet czasu na jedną turę decyzji")
+    parser.add_argument("--unbatched", action="store_true", help="rozgrywaj stoły po kolei, bez grupowania")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    engines = create_tables(args.tables, args.players, args.stack, args.small_blind, args.big_blind, args.seed)
+    policy = POLICIES[args.policy](deadline=args.deadline_ms / 1000, rng=random.Random(args.seed))
+
+    started = time.perf_counter()
+    if args.unbatched:
+        hands = decisions = 0
+        for engine in engines:
+            engine.bot_policy = policy
+            while engine.hands_played < args.hands and len(engine.seated_players()) >= 2:
+                decisions += play_unbatched(engine)
+                hands += 1
+    else:
+        batcher = TableBatcher(engines, policy, max_hands=args.hands)
+        batcher.run()
+        hands = batcher.hands_finished
+        decisions = batcher.decisions
+    elapsed = time.perf_counter() - started
+
+    print(f"{len(engines)} stołów, {hands} rozdań, {decisions} decyzji w {elapsed:.2f}s "
+          f"({hands / elapsed:.0f} rozdań/s, {decisions / elapsed:.0f} decyzji/s)")
+    if getattr(policy, "decisions", 0):
+        print(f"Decyzje bez symulacji equity: {policy.fallbacks / policy.decisions:.1%}")
+
+
+if __name__ == "__main__":
+    main()
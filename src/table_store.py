@@ -0,0 +1,79 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+import numpy as np
+
+MAGIC = b"PKTB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+ENTRY = struct.Struct("<32sc7xQQ")
+ALIGNMENT = 8
+LITTLE_ENDIAN = 0
+
+
+def write_tables(path, tables, meta=None):
+    entries = []
+    offset = HEADER.size + ENTRY.size * len(tables)
+    offset += -offset % ALIGNMENT
+    blobs = []
+    for name, values in tables.items():
+        if isinstance(values, (bytes, bytearray)):
+            values = array('B', values)
+        if sys.byteorder == "big":
+            values = array(values.typecode, values)
+            values.byteswap()
+        data = values.tobytes()
+        entries.append(ENTRY.pack(name.encode('utf-8'), values.typecode.encode('ascii'), offset, len(values)))
+        padding = b"\0" * (-len(data) % ALIGNMENT)
+        blobs.append(data + padding)
+        offset += len(data) + len(padding)
+
+    meta_bytes = json.dumps(meta or {}, separators=(',', ':')).encode('utf-8')
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as table_file:
+            table_file.write(HEADER.pack(MAGIC, VERSION, len(tables), LITTLE_ENDIAN))
+            table_file.write(b"".join(entries))
+            table_file.write(b"\0" * (-(HEADER.size + ENTRY.size * len(tables)) % ALIGNMENT))
+            table_file.write(b"".join(blobs))
+            table_file.write(meta_bytes)
+            table_file.write(struct.pack("<Q", len(meta_bytes)))
+        os.replace(tmp_path, path)
+    except IOError as e:
+        print(f"Błąd zapisu tablicy: {e}")
+        raise
+
+
+class TableStore:
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as table_file:
+            self._mmap = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        magic, version, count, byte_order = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Nieprawidłowy plik tablicy: {path}")
+        if byte_order != LITTLE_ENDIAN:
+            raise ValueError(f"Plik tablicy zapisano z inną kolejnością bajtów: {path}")
+
+        self.entries = {}
+        for index in range(count):
+            name, typecode, offset, length = ENTRY.unpack_from(self._mmap, HEADER.size + index * ENTRY.size)
+            self.entries[name.rstrip(b"\0").decode('utf-8')] = (typecode.decode('ascii'), offset, length)
+
+        meta_length = struct.unpack_from("<Q", self._mmap, len(self._mmap) - 8)[0]
+        meta_start = len(self._mmap) - 8 - meta_length
+        self.meta = json.loads(bytes(self._view[meta_start:meta_start + meta_length]))
+
+    def names(self):
+        return list(self.entries)
+
+    def get(self, name):
+        typecode, offset, length = self.entries[name]
+        dtype = np.dtype(typecode).newbyteorder('<')
+        return np.frombuffer(self._mmap, dtype=dtype, count=length, offset=offset)
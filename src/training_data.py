@@ -0,0 +1,238 @@
+import argparse
+import os
+import random
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from src.bot_policy import POLICIES
+from src.equity import encode_card
+from src.headless_engine import HeadlessGameEngine
+from src.player import Player
+
+MAGIC = b"PKTD"
+VERSION = 3
+MAX_SEATS = 6
+STAGES = ["pre-flop", "betting", "exchange", "showdown"]
+ACTIONS = ["fold", "check", "call", "raise", "draw"]
+FIELDS = (["hand_id"] + [f"card{i}" for i in range(5)] + ["seat", "stage", "action", "active", "discards",
+          "pot", "to_call", "amount"] + [f"stack{i}" for i in range(MAX_SEATS)] + ["result"])
+
+HEADER = struct.Struct("<4sHHH")
+RECORD = struct.Struct(f"<Q5BBBBBBIII{MAX_SEATS}Ii")
+LAYOUT = ";".join([",".join(FIELDS), ",".join(STAGES), ",".join(ACTIONS)]).encode('ascii')
+
+
+class ShardWriter:
+    def __init__(self, directory, prefix, records_per_shard=1000000, buffer_records=4096):
+        self.directory = directory
+        self.prefix = prefix
+        self.records_per_shard = records_per_shard
+        self.buffer_records = buffer_records
+        self.buffer = bytearray()
+        self.buffered = 0
+        self.shard_records = 0
+        self.records = 0
+        self.paths = []
+        self.file = None
+        self.tmp_path = None
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, record):
+        if self.file is None:
+            self._open()
+        self.buffer += RECORD.pack(*record)
+        self.buffered += 1
+        self.shard_records += 1
+        self.records += 1
+        if self.buffered >= self.buffer_records:
+            self.flush()
+        if self.shard_records >= self.records_per_shard:
+            self._finish()
+
+    def flush(self):
+        if self.file is not None and self.buffer:
+            try:
+                self.file.write(self.buffer)
+            except IOError as e:
+                print(f"Błąd zapisu danych treningowych: {e}")
+                raise
+        self.buffer = bytearray()
+        self.buffered = 0
+
+    def close(self):
+        if self.file is not None:
+            self._finish()
+        return self.paths
+
+    def _open(self):
+        path = os.path.join(self.directory, f"{self.prefix}-{len(self.paths):04d}.bin")
+        self.tmp_path = f"{path}.tmp"
+        try:
+            self.file = open(self.tmp_path, 'wb')
+            self.file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, len(LAYOUT)) + LAYOUT)
+        except IOError as e:
+            print(f"Błąd zapisu danych treningowych: {e}")
+            raise
+        self.paths.append(path)
+        self.shard_records = 0
+
+    def _finish(self):
+        self.flush()
+        self.file.close()
+        os.replace(self.tmp_path, self.paths[-1])
+        self.file = None
+
+
+def read_records(path):
+    with open(path, 'rb') as shard_file:
+        magic, version, record_size, layout_size = HEADER.unpack(shard_file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            raise ValueError(f"Nieprawidłowy plik danych treningowych: {path}")
+        if shard_file.read(layout_size) != LAYOUT:
+            raise ValueError(f"Nieznany układ rekordów w pliku danych treningowych: {path}")
+        while True:
+            chunk = shard_file.read(RECORD.size * 4096)
+            if not chunk:
+                break
+            yield from RECORD.iter_unpack(chunk)
+
+
+def decision_records(engine, hands, starting_stack, producer=0):
+    hand = 0
+    while hand < hands:
+        hand_id = (producer << 32) | hand
+        if len(engine.seated_players()) < 2:
+            for player in engine.players:
+                player.set_stack_amount(starting_stack)
+
+        stacks_before = [player.get_stack_amount() for player in engine.players]
+        pending = []
+        last = None
+        play = engine.play_hand()
+        try:
+            request = next(play)
+            while True:
+                kind, player, to_call = request
+                seat = engine.players.index(player)
+                stacks = [p.get_stack_amount() for p in engine.players] + [0] * (MAX_SEATS - len(engine.players))
+                state = [hand_id] + [encode_card(card) for card in player.get_hand()] + [
+                    seat, STAGES.index(engine.current_stage), 0,
+                    sum(1 for p in engine.players if not p.folded), 0, engine.pot, to_call or 0, 0
+                ] + stacks + [0]
+
+                answer = engine.answer(request)
+                if kind == "draw":
+                    state[8] = ACTIONS.index("draw")
+                    state[10] = sum(1 << index for index in answer)
+                    state[13] = len(answer)
+                pending.append((seat, state))
+                last = (state, player, player.current_bet) if kind == "bet" else None
+
+                request = play.send(answer)
+                _complete(last)
+                last = None
+        except StopIteration:
+            _complete(last)
+
+        for seat, state in pending:
+            state[-1] = engine.players[seat].get_stack_amount() - stacks_before[seat]
+            yield state
+        hand += 1
+
+
+def _complete(last):
+    if last is None:
+        return
+    state, player, bet_before = last
+    state[8] = ACTIONS.index(player.last_action)
+    state[13] = player.current_bet - bet_before
+
+
+def produce_shard(directory, job, hands, players, stack, small_blind, big_blind, policy_name,
+                  deadline, records_per_shard, seed):
+    rng = random.Random(seed)
+    seats = [Player(stack, f"Bot {seat + 1}") for seat in range(players)]
+    policy = POLICIES[policy_name](deadline=deadline, rng=random.Random(rng.getrandbits(64)))
+    engine = HeadlessGameEngine(seats, small_blind=small_blind, big_blind=big_blind,
+                                bot_policy=policy, rng=random.Random(rng.getrandbits(64)))
+
+    writer = ShardWriter(directory, f"part-{job:05d}", records_per_shard)
+    try:
+        for record in decision_records(engine, hands, stack, job):
+            writer.write(record)
+    finally:
+        paths = writer.close()
+    return writer.records, paths
+
+
+def generate(directory, hands, jobs=None, players=4, stack=1000, small_blind=25, big_blind=50,
+             policy="strength", deadline=0.0, records_per_shard=1000000, workers=1, seed=None):
+    if not 2 <= players <= MAX_SEATS:
+        raise ValueError(f"Liczba graczy musi być od 2 do {MAX_SEATS}")
+    jobs = jobs or max(1, workers)
+    rng = random.Random(seed)
+    per_job = [hands // jobs + (1 if job < hands % jobs else 0) for job in range(jobs)]
+    tasks = [(directory, job, count, players, stack, small_blind, big_blind, policy, deadline,
+              records_per_shard, rng.getrandbits(64)) for job, count in enumerate(per_job) if count]
+
+    records = 0
+    paths = []
+    if workers <= 1:
+        for task in tasks:
+            count, shard_paths = produce_shard(*task)
+            records += count
+            paths.extend(shard_paths)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            remaining = list(tasks)
+            while remaining or pending:
+                while remaining and len(pending) < workers * 2:
+                    pending.add(pool.submit(produce_shard, *remaining.pop(0)))
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    count, shard_paths = future.result()
+                    records += count
+                    paths.extend(shard_paths)
+    return records, sorted(paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generuje dane treningowe z decyzji botów w grach bez GUI")
+    parser.add_argument("directory", help="katalog na pliki z rekordami")
+    parser.add_argument("--hands", type=int, default=10000, help="łączna liczba rozdań")
+    parser.add_argument("--jobs", type=int, help="liczba niezależnych stołów (domyślnie tyle co procesów)")
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--stack", type=int, default=1000)
+    parser.add_argument("--small-blind", type=int, default=25)
+    parser.add_argument("--big-blind", type=int, default=50)
+    parser.add_argument("--policy", choices=list(POLICIES), default="strength")
+    parser.add_argument("--deadline-ms", type=float, default=0, help="budżet czasu na decyzję (0 = bez symulacji)")
+    parser.add_argument("--shard-records", type=int, default=1000000, help="rekordów na plik")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--inspect", action="store_true", help="wypisz podsumowanie istniejących plików")
+    args = parser.parse_args()
+
+    if args.inspect:
+        names = sorted(name for name in os.listdir(args.directory) if name.endswith(".bin"))
+        total = 0
+        for name in names:
+            count = sum(1 for _ in read_records(os.path.join(args.directory, name)))
+            total += count
+            print(f"{name}: {count} rekordów")
+        print(f"Razem {total} rekordów po {RECORD.size} B")
+        return
+
+    started = time.perf_counter()
+    records, paths = generate(args.directory, args.hands, args.jobs, args.players, args.stack,
+                              args.small_blind, args.big_blind, args.policy, args.deadline_ms / 1000,
+                              args.shard_records, args.workers, args.seed)
+    elapsed = time.perf_counter() - started
+    print(f"{records} decyzji w {len(paths)} plikach ({records * RECORD.size / 1e6:.1f} MB) w {elapsed:.2f}s "
+          f"({records / elapsed:.0f} decyzji/s)")
+
+
+if __name__ == "__main__":
+    main()
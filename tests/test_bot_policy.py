@@ -0,0 +1,24 @@
+import random
+
+from src.bot_policy import StrengthPolicy
+from src.card import Card
+from src.decision_cache import DecisionCache
+from src.headless_engine import HeadlessGameEngine
+from src.player import Player
+
+
+def betting_spot(to_call, pot=1000):
+    player = Player(5000, "A")
+    player.set_hand([Card(rank, suit) for rank, suit in [("K", "s"), ("J", "h"), ("9", "d"), ("6", "c"), ("2", "s")]])
+    engine = HeadlessGameEngine([player, Player(5000, "B")], rng=random.Random(1))
+    engine.current_stage = "betting"
+    engine.pot = pot
+    return engine, player
+
+
+def test_cached_check_is_not_replayed_against_a_bet():
+    policy = StrengthPolicy(deadline=0, bluff=0, cache=DecisionCache(), rng=random.Random(1))
+    uncached = StrengthPolicy(deadline=0, bluff=0, rng=random.Random(1))
+
+    assert policy.decide(*betting_spot(0), 0) == 'check'
+    assert policy.decide(*betting_spot(50), 50) == uncached.decide(*betting_spot(50), 50) == 'call'
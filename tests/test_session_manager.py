@@ -0,0 +1,48 @@
+import os
+
+from src.deck import Deck
+from src.fileops.session_manager import SessionManager
+from src.player import Player
+
+
+def save_rounds(manager, players, stacks):
+    for stack in stacks:
+        players[0].set_stack_amount(stack)
+        manager.save_session({"completed_round": True, "game_id": 1, "players": players, "deck": Deck()})
+
+
+def test_load_stops_at_a_truncated_delta(tmp_path):
+    manager = SessionManager(str(tmp_path))
+    players = [Player(1000, "Gracz"), Player(1000, "Bot 1")]
+    save_rounds(manager, players, [900, 800, 700])
+    with open(os.path.join(str(tmp_path), "session_1_delta.jsonl"), 'a', encoding='utf-8') as delta_file:
+        delta_file.write('{"round":4,"stacks":{"0":6')
+
+    session = SessionManager(str(tmp_path)).load_session(1)
+
+    assert session["rounds"] == 3
+    assert [player.get_stack_amount() for player in session["players"]] == [700, 1000]
+
+    resumed = SessionManager(str(tmp_path))
+    save_rounds(resumed, session["players"], [650])
+    assert resumed.load_session(1)["rounds"] == 4
+
+
+def test_corrupt_session_does_not_rebuild_catalog_on_every_listing(tmp_path, monkeypatch):
+    manager = SessionManager(str(tmp_path))
+    for game_id in (1, 2):
+        players = [Player(1000, "Gracz"), Player(1000, f"Bot {game_id}")]
+        manager.save_session({"completed_round": True, "game_id": game_id, "players": players, "deck": Deck()})
+    with open(os.path.join(str(tmp_path), "session_3.json"), 'w', encoding='utf-8') as session_file:
+        session_file.write('{"game_id":3,"players":[')
+    os.remove(os.path.join(str(tmp_path), "catalog.jsonl"))
+
+    listing = SessionManager(str(tmp_path))
+    rebuilds = []
+    rebuild = listing.catalog.rebuild
+    monkeypatch.setattr(listing.catalog, "rebuild", lambda manager: rebuilds.append(rebuild(manager)))
+    for query in ("", "b", "bot", "bot 2"):
+        listing.list_sessions(query)
+
+    assert len(rebuilds) == 1
+    assert [entry["game_id"] for entry in listing.list_sessions()] == [2, 1]